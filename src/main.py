@@ -19,6 +19,8 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, TypedDict, Union
 import uuid
 
+from utils.loop import run
+
 # Fix Windows console encoding for emojis
 import sys
 if sys.platform == "win32":
@@ -2131,7 +2133,7 @@ if __name__ == "__main__":
     
 # Run the enhanced test
 #if __name__ == "__main__":
-    asyncio.run(test_enhanced_automation())
+    run(test_enhanced_automation())
 
 class RollbackGuardian:
     async def __call__(self, state: AgentState) -> AgentState:
@@ -4,15 +4,14 @@ Fixed for Windows compatibility and syntax issues
 """
 
 import asyncio
-import json
 import logging
 import os
+import re
 import time
-import shutil
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import uuid
 
 # Try importing optional dependencies
@@ -22,11 +21,13 @@ try:
 except ImportError:
     LLM_AVAILABLE = False
 
-try:
-    import requests
-    REQUESTS_AVAILABLE = True
-except ImportError:
-    REQUESTS_AVAILABLE = False
+from utils.files import atomic_write_text
+from utils.http_pool import close_http_client, get_http_client
+from utils.jsonio import json_dumps, json_loads
+from utils.llm_cache import LLMCache, cache_key
+from utils.loop import run
+from utils.rate_limit import RateLimiter
+from utils.text import count_lines
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -42,9 +43,56 @@ class Config:
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
     github_token: str = os.getenv("GITHUB_TOKEN", "test-github-token")
     github_repo: str = os.getenv("GITHUB_REPO", "test/repo")
+    # Structured outputs (json_schema) need gpt-4o or newer
+    analysis_model: str = os.getenv("OPENAI_ANALYSIS_MODEL", "gpt-4o")
+    force_ai: bool = os.getenv("FORCE_AI_COMPONENTS", "").lower() in ("1", "true", "yes")  # Use the LLM even for templated components
+    llm_cache_dir: str = os.getenv("LLM_CACHE_DIR", "logs/llm_cache")
+    llm_cache_ttl: float = float(os.getenv("LLM_CACHE_TTL", "86400"))
+    batch_timeout: float = float(os.getenv("OPENAI_BATCH_TIMEOUT", "86400"))
+    # Account limits for online calls; 0 disables the corresponding budget
+    openai_rpm: int = int(os.getenv("OPENAI_RPM", "500"))
+    openai_tpm: int = int(os.getenv("OPENAI_TPM", "30000"))
 
 config = Config()
 
+# Shared OpenAI client, created on first use so it binds to the running event loop
+_openai_client = None
+
+def _get_openai_client():
+    """Return the shared AsyncOpenAI client; it reuses the process-wide connection pool"""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = openai.AsyncOpenAI(
+            api_key=config.openai_api_key,
+            max_retries=3,  # Retries 429s, honouring Retry-After
+            timeout=30.0,
+            http_client=get_http_client()
+        )
+    return _openai_client
+
+async def close_clients():
+    """Drop the OpenAI client and close the shared connection pool; call once on shutdown"""
+    global _openai_client
+    _openai_client = None
+    await close_http_client()
+
+# Completions keyed by (model, messages, sampling params); reprocessed tickets skip the API
+_llm_cache = LLMCache(directory=config.llm_cache_dir or None, ttl=config.llm_cache_ttl)
+
+# Spreads online LLM calls across the account's per-minute limits
+_rate_limiter = RateLimiter(rpm=config.openai_rpm, tpm=config.openai_tpm)
+
+def _estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+    """Rough token cost of a request: ~4 characters per prompt token plus the completion budget"""
+    return sum(len(message["content"]) for message in messages) // 4 + max_tokens
+
+# Max component generations in flight per webhook, to stay under OpenAI rate limits
+COMPONENT_CONCURRENCY = 8
+
+# Batch API polling (batch_mode only)
+BATCH_POLL_INTERVAL = 30.0
+BATCH_FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
 def generate_trace_id() -> str:
     return str(uuid.uuid4())
 
@@ -55,26 +103,21 @@ def sanitize_filename(filename: str) -> str:
         filename = filename.replace(char, '_')
     return filename[:200]  # Limit length
 
-def write_generated_file(filename: str, content: str, trace_id: str) -> Dict[str, Any]:
-    """Write generated file to disk"""
+async def write_generated_file(filename: str, content: str, trace_id: str) -> Dict[str, Any]:
+    """Write generated file to disk without blocking the event loop"""
     try:
         # Create safe path
         safe_filename = sanitize_filename(filename)
         file_path = Path("generated_code") / safe_filename
         
-        # Ensure directory exists
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Write file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        await asyncio.to_thread(atomic_write_text, file_path, content)
         
         logger.info(f"✅ Generated file: {file_path}")
         
         return {
             "file": str(file_path),
             "action": "created",
-            "lines": len(content.split('\n')),
+            "lines": count_lines(content),
             "success": True
         }
     except Exception as e:
@@ -86,6 +129,27 @@ def write_generated_file(filename: str, content: str, trace_id: str) -> Dict[str
             "success": False
         }
 
+# System messages shared by every request (never mutated)
+_ARCH_SYSTEM = {"role": "system", "content": "You are a software architect. Return only valid JSON."}
+_REACT_SYSTEM = {"role": "system", "content": "You are an expert React developer. Generate clean, production-ready components."}
+
+# Shape of the AI requirements analysis; strict mode makes the model conform to it
+_REQUIREMENTS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "components_to_create": {"type": "array", "items": {"type": "string"}},
+        "files_to_modify": {"type": "array", "items": {"type": "string"}},
+        "functional_requirements": {"type": "array", "items": {"type": "string"}},
+        "priority": {"type": "string", "enum": ["high", "medium", "low"]}
+    },
+    "required": ["components_to_create", "files_to_modify", "functional_requirements", "priority"],
+    "additionalProperties": False
+}
+_REQUIREMENTS_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "requirements", "schema": _REQUIREMENTS_SCHEMA, "strict": True}
+}
+
 async def analyze_requirements_with_ai(issue_summary: str, issue_description: str) -> Dict[str, Any]:
     """Analyze requirements using AI if available"""
     if not LLM_AVAILABLE or not config.openai_api_key:
@@ -93,34 +157,40 @@ async def analyze_requirements_with_ai(issue_summary: str, issue_description: st
         return analyze_requirements_fallback(issue_description)
     
     try:
-        client = openai.AsyncOpenAI(api_key=config.openai_api_key)
+        client = _get_openai_client()
         
+        # The response shape comes from _REQUIREMENTS_FORMAT, so the prompt doesn't spell it out
         prompt = f"""
-        Analyze this Jira ticket and return a JSON response:
+        Analyze this Jira ticket: list the React components to create, the files to modify
+        (e.g. App.jsx, App.css), the functional requirements and the priority.
         
         Title: {issue_summary}
         Description: {issue_description}
-        
-        Return JSON with:
-        {{
-            "components_to_create": ["ComponentName.jsx"],
-            "files_to_modify": ["App.jsx", "App.css"],
-            "functional_requirements": ["specific functionality"],
-            "priority": "high|medium|low"
-        }}
         """
         
-        response = await client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are a software architect. Return only valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.1,
-            max_tokens=800
-        )
+        messages = [_ARCH_SYSTEM, {"role": "user", "content": prompt}]
+        key = cache_key(config.analysis_model, messages, temperature=0.1, max_tokens=800, response_format=_REQUIREMENTS_FORMAT)
+        content = await _llm_cache.get(key)
+        cached = content is not None
+        
+        if not cached:
+            await _rate_limiter.acquire(_estimate_tokens(messages, 800))
+            response = await client.chat.completions.create(
+                model=config.analysis_model,
+                messages=messages,
+                temperature=0.1,
+                max_tokens=800,
+                response_format=_REQUIREMENTS_FORMAT
+            )
+            message = response.choices[0].message
+            if getattr(message, "refusal", None):
+                raise ValueError(f"model refused: {message.refusal}")
+            content = message.content
         
-        result = json.loads(response.choices[0].message.content)
+        result = json_loads(content)
+        if not cached:
+            # Only cache responses that parsed
+            await _llm_cache.set(key, content)
         logger.info("🤖 AI analysis completed")
         return result
         
@@ -128,46 +198,48 @@ async def analyze_requirements_with_ai(issue_summary: str, issue_description: st
         logger.error(f"🤖 AI analysis failed: {e}")
         return analyze_requirements_fallback(issue_description)
 
+# Fallback analysis rules: feature -> (trigger keywords, functional requirement, component file)
+_FEATURE_RULES: Dict[str, Tuple[Tuple[str, ...], str, str]] = {
+    "export": (("export", "download", "csv"), "Add CSV export functionality", "ExportButton.jsx"),
+    "search": (("search", "filter"), "Add search functionality", "SearchBar.jsx"),
+    "notification": (("notification", "alert"), "Add notification system", "NotificationSystem.jsx"),
+}
+
+# All rule keywords in one pass; the group name is the feature
+_KEYWORD_RE = re.compile(
+    "|".join(f"(?P<{feature}>{'|'.join(keywords)})" for feature, (keywords, _, _) in _FEATURE_RULES.items()),
+    re.IGNORECASE
+)
+
 def analyze_requirements_fallback(description: str) -> Dict[str, Any]:
     """Fallback requirements analysis"""
-    desc_lower = description.lower()
+    features = set()
+    for match in _KEYWORD_RE.finditer(description):
+        features.add(match.lastgroup)
+        if len(features) == len(_FEATURE_RULES):
+            break
     
     requirements = {
         "components_to_create": [],
-        "files_to_modify": [],
+        "files_to_modify": set(),
         "functional_requirements": [],
         "priority": "medium"
     }
     
-    if "export" in desc_lower or "download" in desc_lower or "csv" in desc_lower:
-        requirements["components_to_create"].append("ExportButton.jsx")
-        requirements["files_to_modify"].extend(["App.jsx", "App.css"])
-        requirements["functional_requirements"].append("Add CSV export functionality")
-    
-    if "search" in desc_lower or "filter" in desc_lower:
-        requirements["components_to_create"].append("SearchBar.jsx")
-        requirements["files_to_modify"].extend(["App.jsx", "App.css"])
-        requirements["functional_requirements"].append("Add search functionality")
+    # Rule order, not match order, so the output is stable
+    for feature, (_, functional, component) in _FEATURE_RULES.items():
+        if feature in features:
+            requirements["components_to_create"].append(component)
+            requirements["files_to_modify"].update(("App.jsx", "App.css"))
+            requirements["functional_requirements"].append(functional)
     
-    if "notification" in desc_lower or "alert" in desc_lower:
-        requirements["components_to_create"].append("NotificationSystem.jsx")
-        requirements["files_to_modify"].extend(["App.jsx", "App.css"])
-        requirements["functional_requirements"].append("Add notification system")
-    
-    # Remove duplicates
-    requirements["files_to_modify"] = list(set(requirements["files_to_modify"]))
+    requirements["files_to_modify"] = list(requirements["files_to_modify"])
     
     return requirements
 
-async def generate_component_with_ai(component_name: str, issue_summary: str, issue_description: str) -> str:
-    """Generate React component with AI"""
-    if not LLM_AVAILABLE or not config.openai_api_key:
-        return generate_component_template(component_name, issue_description)
-    
-    try:
-        client = openai.AsyncOpenAI(api_key=config.openai_api_key)
-        
-        prompt = f"""
+def _component_request(component_name: str, issue_summary: str, issue_description: str) -> Dict[str, Any]:
+    """Chat-completions request body for one component, shared by the online and batch paths"""
+    prompt = f"""
         Generate a React functional component: {component_name}
         
         Context: {issue_summary}
@@ -181,29 +253,112 @@ async def generate_component_with_ai(component_name: str, issue_summary: str, is
         
         Return only the component code.
         """
+    
+    return {
+        "model": "gpt-4",
+        "messages": [_REACT_SYSTEM, {"role": "user", "content": prompt}],
+        "temperature": 0.1,
+        "max_tokens": 1500
+    }
+
+def _request_cache_key(body: Dict[str, Any]) -> str:
+    params = {name: value for name, value in body.items() if name not in ("model", "messages")}
+    return cache_key(body["model"], body["messages"], **params)
+
+# Components whose fixed template is already production quality; the LLM is skipped for these
+_TEMPLATED_COMPONENTS = frozenset({"exportbutton", "searchbar"})
+
+def _use_template(component_name: str) -> bool:
+    """Whether to skip the LLM and use generate_component_template for this component"""
+    if not LLM_AVAILABLE or not config.openai_api_key:
+        return True
+    return not config.force_ai and component_name.replace('.jsx', '').lower() in _TEMPLATED_COMPONENTS
+
+async def generate_component_with_ai(component_name: str, issue_summary: str, issue_description: str) -> str:
+    """Generate React component with AI"""
+    if _use_template(component_name):
+        return generate_component_template(component_name, issue_description)
+    
+    try:
+        client = _get_openai_client()
+        body = _component_request(component_name, issue_summary, issue_description)
         
-        response = await client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are an expert React developer. Generate clean, production-ready components."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.1,
-            max_tokens=1500
-        )
+        async def complete() -> str:
+            await _rate_limiter.acquire(_estimate_tokens(body["messages"], body["max_tokens"]))
+            response = await client.chat.completions.create(**body)
+            return response.choices[0].message.content
         
-        return response.choices[0].message.content
+        return await _llm_cache.get_or_create(_request_cache_key(body), complete)
         
     except Exception as e:
         logger.error(f"🤖 AI component generation failed: {e}")
         return generate_component_template(component_name, issue_description)
 
-def generate_component_template(component_name: str, description: str) -> str:
-    """Generate component template"""
-    name_clean = component_name.replace('.jsx', '')
+async def generate_components_batch(components: List[str], issue_key: str, issue_summary: str, issue_description: str) -> List[str]:
+    """Generate components through the OpenAI Batch API.
+    
+    Half the price of online calls and outside the online rate limits, but a batch
+    may take up to its 24h completion window - only for bulk replays and CI runs.
+    Cached and templated components are not submitted; anything the batch doesn't return
+    falls back to the template.
+    """
+    codes: Dict[str, str] = {}
+    bodies = {
+        c: _component_request(c, issue_summary, issue_description)
+        for c in dict.fromkeys(components)
+        if not _use_template(c)
+    }
+    
+    try:
+        pending = {}
+        for component, body in bodies.items():
+            cached = await _llm_cache.get(_request_cache_key(body))
+            if cached is not None:
+                codes[component] = cached
+            else:
+                pending[f"{issue_key}:{component}"] = component
+        
+        if pending:
+            client = _get_openai_client()
+            lines = b"\n".join(
+                json_dumps({"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": bodies[component]})
+                for custom_id, component in pending.items()
+            )
+            batch_file = await client.files.create(file=(f"{issue_key}.jsonl", lines), purpose="batch")
+            batch = await client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            logger.info(f"🤖 Submitted batch {batch.id} with {len(pending)} components")
+            
+            deadline = time.monotonic() + config.batch_timeout
+            while batch.status not in BATCH_FINAL_STATUSES:
+                if time.monotonic() > deadline:
+                    await client.batches.cancel(batch.id)
+                    raise TimeoutError(f"batch {batch.id} still {batch.status} after {config.batch_timeout:.0f}s")
+                await asyncio.sleep(BATCH_POLL_INTERVAL)
+                batch = await client.batches.retrieve(batch.id)
+            
+            if batch.output_file_id:
+                output = await client.files.content(batch.output_file_id)
+                for line in output.text.splitlines():
+                    item = json_loads(line)
+                    component = pending.get(item.get("custom_id"))
+                    response = item.get("response") or {}
+                    if component and response.get("status_code") == 200:
+                        content = response["body"]["choices"][0]["message"]["content"]
+                        codes[component] = content
+                        await _llm_cache.set(_request_cache_key(bodies[component]), content)
+            logger.info(f"🤖 Batch {batch.id} {batch.status}: {len(codes)}/{len(bodies)} components generated")
+        
+    except Exception as e:
+        logger.error(f"🤖 Batch component generation failed: {e}")
     
-    if "export" in name_clean.lower():
-        return '''import React from 'react';
+    return [codes.get(c) or generate_component_template(c, issue_description) for c in components]
+
+# Fixed component templates, matched by substring of the component name
+_EXPORT_BUTTON_TEMPLATE = '''import React from 'react';
 
 const ExportButton = ({ todos }) => {
   const exportToCSV = () => {
@@ -243,9 +398,8 @@ const ExportButton = ({ todos }) => {
 };
 
 export default ExportButton;'''
-    
-    elif "search" in name_clean.lower():
-        return '''import React from 'react';
+
+_SEARCH_BAR_TEMPLATE = '''import React from 'react';
 
 const SearchBar = ({ searchTerm, onSearchChange }) => {
   return (
@@ -270,13 +424,26 @@ const SearchBar = ({ searchTerm, onSearchChange }) => {
 };
 
 export default SearchBar;'''
+
+_COMPONENT_TEMPLATES = (
+    ("export", _EXPORT_BUTTON_TEMPLATE),
+    ("search", _SEARCH_BAR_TEMPLATE),
+)
+
+def generate_component_template(component_name: str, description: str) -> str:
+    """Generate component template"""
+    name_clean = component_name.replace('.jsx', '')
+    
+    lower_name = name_clean.lower()
+    template = next((tpl for key, tpl in _COMPONENT_TEMPLATES if key in lower_name), None)
+    if template:
+        return template
     
-    else:
-        return f'''import React from 'react';
+    return f'''import React from 'react';
 
 const {name_clean} = () => {{
   return (
-    <div className="{name_clean.lower()}">
+    <div className="{lower_name}">
       <h3>{name_clean}</h3>
       <p>Generated component for: {description[:50]}...</p>
     </div>
@@ -285,122 +452,79 @@ const {name_clean} = () => {{
 
 export default {name_clean};'''
 
-def generate_app_jsx(requirements: Dict[str, Any]) -> str:
-    """Generate App.jsx based on requirements"""
-    has_export = any("export" in comp.lower() for comp in requirements.get("components_to_create", []))
-    has_search = any("search" in comp.lower() for comp in requirements.get("components_to_create", []))
-    
-    imports = ["import { useState, useEffect } from 'react';"]
-    if has_export:
-        imports.append("import ExportButton from './components/ExportButton';")
-    if has_search:
-        imports.append("import SearchBar from './components/SearchBar';")
-    imports.append("import './App.css';")
-    
-    state_vars = [
-        "const [todos, setTodos] = useState([]);",
-        "const [loading, setLoading] = useState(true);",
-        "const [newTodo, setNewTodo] = useState('');"
-    ]
-    if has_search:
-        state_vars.append("const [searchTerm, setSearchTerm] = useState('');")
-    
-    search_filter = """
-  const filteredTodos = todos.filter(todo => 
-    todo.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
-    (todo.description && todo.description.toLowerCase().includes(searchTerm.toLowerCase()))
-  );""" if has_search else "\n  const filteredTodos = todos;"
-    
-    search_component = """
-        <div className="search-section">
-          <SearchBar 
-            searchTerm={searchTerm}
-            onSearchChange={setSearchTerm}
-          />
-        </div>""" if has_search else ""
-    
-    export_component = """
-        <div className="export-section">
-          <ExportButton todos={filteredTodos} />
-        </div>""" if has_export else ""
-    
-    return f"""{chr(10).join(imports)}
-
-function App() {{
-  {chr(10).join('  ' + var for var in state_vars)}
-
-  useEffect(() => {{
+# Fixed parts of the generated App.jsx; generate_app_jsx joins them with the feature-specific pieces
+_APP_JSX_HANDLERS = """  useEffect(() => {
     fetchTodos();
-  }}, []);
+  }, []);
 
-  const fetchTodos = async () => {{
-    try {{
+  const fetchTodos = async () => {
+    try {
       const response = await fetch('http://localhost:3001/api/todos');
       const data = await response.json();
       setTodos(data);
-    }} catch (error) {{
+    } catch (error) {
       console.error('Failed to fetch todos:', error);
-    }} finally {{
+    } finally {
       setLoading(false);
-    }}
-  }};
+    }
+  };
 
-  const addTodo = async () => {{
+  const addTodo = async () => {
     if (!newTodo.trim()) return;
     
-    try {{
-      const response = await fetch('http://localhost:3001/api/todos', {{
+    try {
+      const response = await fetch('http://localhost:3001/api/todos', {
         method: 'POST',
-        headers: {{ 'Content-Type': 'application/json' }},
-        body: JSON.stringify({{ title: newTodo, priority: 'medium' }})
-      }});
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ title: newTodo, priority: 'medium' })
+      });
       
-      if (response.ok) {{
+      if (response.ok) {
         const todo = await response.json();
         setTodos([todo, ...todos]);
         setNewTodo('');
-      }}
-    }} catch (error) {{
+      }
+    } catch (error) {
       console.error('Failed to add todo:', error);
-    }}
-  }};
+    }
+  };
 
-  const toggleTodo = async (id, completed) => {{
-    try {{
-      const response = await fetch(`http://localhost:3001/api/todos/${{id}}`, {{
+  const toggleTodo = async (id, completed) => {
+    try {
+      const response = await fetch(`http://localhost:3001/api/todos/${id}`, {
         method: 'PUT',
-        headers: {{ 'Content-Type': 'application/json' }},
-        body: JSON.stringify({{ completed }})
-      }});
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ completed })
+      });
       
-      if (response.ok) {{
+      if (response.ok) {
         const updatedTodo = await response.json();
         setTodos(todos.map(todo => todo.id === id ? updatedTodo : todo));
-      }}
-    }} catch (error) {{
+      }
+    } catch (error) {
       console.error('Failed to update todo:', error);
-    }}
-  }};
+    }
+  };
 
-  const deleteTodo = async (id) => {{
+  const deleteTodo = async (id) => {
     if (!window.confirm('Delete this todo?')) return;
     
-    try {{
-      const response = await fetch(`http://localhost:3001/api/todos/${{id}}`, {{
+    try {
+      const response = await fetch(`http://localhost:3001/api/todos/${id}`, {
         method: 'DELETE'
-      }});
+      });
       
-      if (response.ok) {{
+      if (response.ok) {
         setTodos(todos.filter(todo => todo.id !== id));
-      }}
-    }} catch (error) {{
+      }
+    } catch (error) {
       console.error('Failed to delete todo:', error);
-    }}
-  }};
+    }
+  };
 
-  if (loading) return <div className="loading">Loading todos...</div>;{search_filter}
+  if (loading) return <div className="loading">Loading todos...</div>;"""
 
-  return (
+_APP_JSX_VIEW_HEAD = """  return (
     <div className="app">
       <header className="header">
         <h1>🚀 Todo App</h1>
@@ -411,60 +535,113 @@ function App() {{
         <div className="add-todo">
           <input
             type="text"
-            value={{newTodo}}
-            onChange={{(e) => setNewTodo(e.target.value)}}
+            value={newTodo}
+            onChange={(e) => setNewTodo(e.target.value)}
             placeholder="What needs to be done?"
-            onKeyPress={{(e) => e.key === 'Enter' && addTodo()}}
+            onKeyPress={(e) => e.key === 'Enter' && addTodo()}
           />
-          <button onClick={{addTodo}}>Add Todo</button>
-        </div>{search_component}{export_component}
+          <button onClick={addTodo}>Add Todo</button>
+        </div>"""
+
+_APP_JSX_VIEW_TAIL = """
         
         <div className="filter-info">
-          <p>Showing: {{filteredTodos.length}} of {{todos.length}} todos</p>
+          <p>Showing: {filteredTodos.length} of {todos.length} todos</p>
         </div>
         
         <div className="todos">
-          {{filteredTodos.map(todo => (
-            <div key={{todo.id}} className={{`todo-item ${{todo.completed ? 'completed' : ''}} priority-${{todo.priority}}`}}>
+          {filteredTodos.map(todo => (
+            <div key={todo.id} className={`todo-item ${todo.completed ? 'completed' : ''} priority-${todo.priority}`}>
               <input
                 type="checkbox"
-                checked={{todo.completed}}
-                onChange={{(e) => toggleTodo(todo.id, e.target.checked)}}
+                checked={todo.completed}
+                onChange={(e) => toggleTodo(todo.id, e.target.checked)}
               />
               <div className="todo-content">
-                <span className="todo-title">{{todo.title}}</span>
-                {{todo.description && <span className="todo-description">{{todo.description}}</span>}}
+                <span className="todo-title">{todo.title}</span>
+                {todo.description && <span className="todo-description">{todo.description}</span>}
                 <div className="todo-meta">
-                  <span className="priority">{{todo.priority}}</span>
-                  <span className="date">{{new Date(todo.created_at).toLocaleDateString()}}</span>
+                  <span className="priority">{todo.priority}</span>
+                  <span className="date">{new Date(todo.created_at).toLocaleDateString()}</span>
                 </div>
               </div>
-              <button onClick={{() => deleteTodo(todo.id)}} className="delete-btn">🗑️</button>
+              <button onClick={() => deleteTodo(todo.id)} className="delete-btn">🗑️</button>
             </div>
-          ))}}
+          ))}
         </div>
         
-        {{filteredTodos.length === 0 && todos.length > 0 && (
+        {filteredTodos.length === 0 && todos.length > 0 && (
           <div className="empty-state">
             <p>No todos match your search</p>
           </div>
-        )}}
+        )}
         
-        {{todos.length === 0 && (
+        {todos.length === 0 && (
           <div className="empty-state">
             <p>No todos yet. Add one above!</p>
           </div>
-        )}}
+        )}
       </main>
     </div>
   );
-}}
+}
 
 export default App;"""
 
-def generate_app_css() -> str:
-    """Generate App.css"""
-    return '''* {
+def generate_app_jsx(requirements: Dict[str, Any]) -> str:
+    """Generate App.jsx based on requirements"""
+    has_export = any("export" in comp.lower() for comp in requirements.get("components_to_create", []))
+    has_search = any("search" in comp.lower() for comp in requirements.get("components_to_create", []))
+    
+    imports = ["import { useState, useEffect } from 'react';"]
+    if has_export:
+        imports.append("import ExportButton from './components/ExportButton';")
+    if has_search:
+        imports.append("import SearchBar from './components/SearchBar';")
+    imports.append("import './App.css';")
+    
+    state_vars = [
+        "const [todos, setTodos] = useState([]);",
+        "const [loading, setLoading] = useState(true);",
+        "const [newTodo, setNewTodo] = useState('');"
+    ]
+    if has_search:
+        state_vars.append("const [searchTerm, setSearchTerm] = useState('');")
+    
+    search_filter = """
+  const filteredTodos = todos.filter(todo => 
+    todo.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
+    (todo.description && todo.description.toLowerCase().includes(searchTerm.toLowerCase()))
+  );""" if has_search else "\n  const filteredTodos = todos;"
+    
+    search_component = """
+        <div className="search-section">
+          <SearchBar 
+            searchTerm={searchTerm}
+            onSearchChange={setSearchTerm}
+          />
+        </div>""" if has_search else ""
+    
+    export_component = """
+        <div className="export-section">
+          <ExportButton todos={filteredTodos} />
+        </div>""" if has_export else ""
+    
+    state_block = "\n".join("  " + var for var in state_vars)
+    
+    parts = [
+        "\n".join(imports),
+        "",
+        "function App() {",
+        "  " + state_block,
+        "",
+        _APP_JSX_HANDLERS + search_filter,
+        "",
+        _APP_JSX_VIEW_HEAD + search_component + export_component + _APP_JSX_VIEW_TAIL
+    ]
+    return "\n".join(parts)
+
+_APP_CSS = '''* {
   margin: 0;
   padding: 0;
   box-sizing: border-box;
@@ -665,9 +842,20 @@ body {
   .add-todo { flex-direction: column; }
 }'''
 
+def generate_app_css() -> str:
+    """Generate App.css"""
+    return _APP_CSS
+
+GITHUB_TIMEOUT = 10.0
+
+# (fetched at, sha) of main; branches created within MAIN_SHA_TTL seconds reuse it
+MAIN_SHA_TTL = 30.0
+_main_sha_cache: Optional[Tuple[float, str]] = None
+
 async def create_github_branch(branch_name: str) -> bool:
     """Create GitHub branch"""
-    if not REQUESTS_AVAILABLE or config.github_token == "test-github-token":
+    global _main_sha_cache
+    if config.github_token == "test-github-token":
         logger.info(f"🔗 GitHub simulation: would create branch {branch_name}")
         return True
     
@@ -677,25 +865,36 @@ async def create_github_branch(branch_name: str) -> bool:
             "Accept": "application/vnd.github.v3+json"
         }
         
-        # Get main branch SHA
-        url = f"https://api.github.com/repos/{config.github_repo}/git/refs/heads/main"
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code != 200:
-            logger.error(f"Failed to get main branch: {response.text}")
-            return False
-        
-        main_sha = response.json()["object"]["sha"]
+        # Get main branch SHA, unless fetched moments ago
+        cached = _main_sha_cache is not None and time.monotonic() - _main_sha_cache[0] < MAIN_SHA_TTL
+        if cached:
+            main_sha = _main_sha_cache[1]
+        else:
+            url = f"https://api.github.com/repos/{config.github_repo}/git/refs/heads/main"
+            response = await get_http_client().get(url, headers=headers, timeout=GITHUB_TIMEOUT)
+            
+            if response.status_code != 200:
+                logger.error(f"Failed to get main branch: {response.text}")
+                return False
+            
+            main_sha = response.json()["object"]["sha"]
+            _main_sha_cache = (time.monotonic(), main_sha)
         
         # Create branch
         url = f"https://api.github.com/repos/{config.github_repo}/git/refs"
         data = {"ref": f"refs/heads/{branch_name}", "sha": main_sha}
-        response = requests.post(url, headers=headers, json=data)
+        response = await get_http_client().post(url, headers=headers, json=data, timeout=GITHUB_TIMEOUT)
         
         if response.status_code == 201:
             logger.info(f"✅ Created GitHub branch: {branch_name}")
             return True
+        elif response.status_code == 422 and "already exists" in response.text:
+            logger.warning(f"⚠️ GitHub branch already exists: {branch_name}")
+            return True
         else:
+            if response.status_code == 422:
+                # Possibly a stale cached SHA (e.g. force-pushed main): fetch it fresh next time
+                _main_sha_cache = None
             logger.error(f"Failed to create branch: {response.text}")
             return False
             
@@ -703,22 +902,18 @@ async def create_github_branch(branch_name: str) -> bool:
         logger.error(f"GitHub branch creation failed: {e}")
         return False
 
-def generate_report(issue_key: str, summary: str, file_changes: List[Dict], errors: List[str]) -> str:
-    """Generate markdown report"""
-    status = "✅ SUCCESS" if file_changes and not errors else "❌ FAILED"
-    
-    return f"""# 🤖 LangGraph DevOps Autocoder Report
+_REPORT_TEMPLATE = """# 🤖 LangGraph DevOps Autocoder Report
 
 ## {status} Automation Summary
 - **Issue**: {issue_key} - {summary}
-- **Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-- **Files Created**: {len(file_changes)}
+- **Generated**: {generated}
+- **Files Created**: {file_count}
 
 ## 📁 Generated Files
-{chr(10).join(f'- {change["file"]} ({change["lines"]} lines)' for change in file_changes if change["success"])}
+{files}
 
 ## ⚠️ Issues
-{chr(10).join(f'- {error}' for error in errors) if errors else '✅ No issues encountered'}
+{issues}
 
 ## 🎯 Next Steps
 1. Review generated files in `generated_code/` directory
@@ -730,10 +925,25 @@ def generate_report(issue_key: str, summary: str, file_changes: List[Dict], erro
 *Generated by LangGraph DevOps Autocoder*
 """
 
+def generate_report(issue_key: str, summary: str, file_changes: List[Dict], errors: List[str]) -> str:
+    """Generate markdown report"""
+    return _REPORT_TEMPLATE.format(
+        status="✅ SUCCESS" if file_changes and not errors else "❌ FAILED",
+        issue_key=issue_key,
+        summary=summary,
+        generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        file_count=len(file_changes),
+        files="\n".join(f'- {change["file"]} ({change["lines"]} lines)' for change in file_changes if change["success"]),
+        issues="\n".join(f'- {error}' for error in errors) if errors else '✅ No issues encountered'
+    )
+
 # MAIN PROCESSING FUNCTION - This is what server.py imports
-async def process_jira_webhook(webhook_payload: Dict[str, Any]) -> Dict[str, Any]:
+async def process_jira_webhook(webhook_payload: Dict[str, Any], batch_mode: bool = False) -> Dict[str, Any]:
     """
     Main webhook processing function
+    
+    batch_mode sends component generation through the OpenAI Batch API: half
+    the cost, but results can take hours. Leave it off for live webhooks.
     """
     trace_id = generate_trace_id()
     
@@ -760,10 +970,24 @@ async def process_jira_webhook(webhook_payload: Dict[str, Any]) -> Dict[str, Any
         # 2. Code Generation
         logger.info(f"[{trace_id}] 🔧 Generating code...")
         
-        # Generate components
-        for component in requirements.get('components_to_create', []):
-            logger.info(f"[{trace_id}] Creating component: {component}")
-            code = await generate_component_with_ai(component, issue_summary, issue_description)
+        components = requirements.get('components_to_create', [])
+        if batch_mode:
+            logger.info(f"[{trace_id}] Creating {len(components)} components via the Batch API")
+            codes = await generate_components_batch(components, issue_key, issue_summary, issue_description)
+        else:
+            # Generate components concurrently, a bounded number at a time
+            semaphore = asyncio.Semaphore(COMPONENT_CONCURRENCY)
+            
+            async def generate_component(component: str) -> str:
+                async with semaphore:
+                    logger.info(f"[{trace_id}] Creating component: {component}")
+                    return await generate_component_with_ai(component, issue_summary, issue_description)
+            
+            codes = await asyncio.gather(*(generate_component(c) for c in components), return_exceptions=True)
+        for component, code in zip(components, codes):
+            if isinstance(code, Exception):
+                logger.error(f"[{trace_id}] Component {component} failed: {code}")
+                code = generate_component_template(component, issue_description)
             safe_path = f"components/{component}"
             generated_code[safe_path] = code
         
@@ -779,23 +1003,28 @@ async def process_jira_webhook(webhook_payload: Dict[str, Any]) -> Dict[str, Any
             css_code = generate_app_css()
             generated_code['App.css'] = css_code
         
-        # 3. Write files to disk
+        # 3. GitHub Integration, overlapped with writing the files to disk
+        branch_name = f"feature/{issue_key.lower()}-{int(time.time())}"
+        logger.info(f"[{trace_id}] 🔗 Creating GitHub branch...")
+        github_task = asyncio.create_task(create_github_branch(branch_name))
+        
+        # 4. Write files to disk
         logger.info(f"[{trace_id}] 💾 Writing {len(generated_code)} files...")
-        for filename, content in generated_code.items():
-            result = write_generated_file(filename, content, trace_id)
+        results = await asyncio.gather(
+            *(write_generated_file(filename, content, trace_id) for filename, content in generated_code.items())
+        )
+        for filename, result in zip(generated_code, results):
             file_changes.append(result)
             if not result['success']:
                 errors.append(f"Failed to write {filename}")
         
-        # 4. GitHub Integration
-        branch_name = f"feature/{issue_key.lower()}-{int(time.time())}"
-        logger.info(f"[{trace_id}] 🔗 Creating GitHub branch...")
-        github_success = await create_github_branch(branch_name)
-        
-        # 5. Generate Report
+        # 5. Generate Report (it needs the write results) while the branch may still be in flight
         logger.info(f"[{trace_id}] 📊 Generating report...")
         report_content = generate_report(issue_key, issue_summary, file_changes, errors)
-        report_result = write_generated_file(f"reports/{issue_key}.md", report_content, trace_id)
+        report_result, github_success = await asyncio.gather(
+            write_generated_file(f"reports/{issue_key}.md", report_content, trace_id),
+            github_task
+        )
         
         # Calculate success metrics
         successful_files = [f for f in file_changes if f['success']]
@@ -853,8 +1082,11 @@ if __name__ == "__main__":
             }
         }
         
-        result = await process_jira_webhook(test_payload)
+        try:
+            result = await process_jira_webhook(test_payload)
+        finally:
+            await close_clients()
         print(f"✅ Test completed: {result['overall_status']}")
         print(f"📁 Files generated: {len(result['generated_code'])}")
     
-    asyncio.run(test())
\ No newline at end of file
+    run(test())
\ No newline at end of file
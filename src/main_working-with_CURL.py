@@ -4,70 +4,67 @@ With Complete Jira and GitHub Integration
 """
 
 import asyncio
+import atexit
 import base64
-import json
+import importlib.util
 import logging
+import logging.handlers
 import os
+import queue
+import re
 import shutil
-import subprocess
+import string
 import time
 import uuid
+from collections import ChainMap, OrderedDict
 from dataclasses import dataclass, field
-from datetime import datetime
+from functools import cached_property, lru_cache
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, TypedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, TypedDict
 
 # External integrations
-import requests
+import httpx
+# openai (and the pydantic models it pulls in) is only imported once an LLM call is made
+LLM_AVAILABLE = importlib.util.find_spec("openai") is not None
+
+# GitPython commits in-process instead of spawning git for add/commit/rev-parse
 try:
-    import openai
-    LLM_AVAILABLE = True
+    import git
+    GIT_AVAILABLE = True
 except ImportError:
-    LLM_AVAILABLE = False
-    
-# Manual .env file loader (add this after your existing imports)
-import os
-from pathlib import Path
+    GIT_AVAILABLE = False
 
 from dotenv import load_dotenv
 
-# Let the function find the .env file automatically
-load_dotenv()
+from utils.files import atomic_write_text
+from utils.http_pool import close_http_client, get_http_client
+from utils.jsonio import json_dumps, json_loads
+from utils.llm_cache import LLMCache, cache_key
+from utils.loop import run
+from utils.retry import retry_async
+from utils.text import count_lines
 
-# def load_env_file():
-#     """Manually load environment variables from .env file"""
-#     env_file = Path('../.env')
-#     if env_file.exists():
-#         print(f"Loading environment variables from {env_file.absolute()}")
-#         with open(env_file, 'r') as f:
-#             for line_num, line in enumerate(f, 1):
-#                 line = line.strip()
-#                 if line and not line.startswith('#') and '=' in line:
-#                     try:
-#                         key, value = line.split('=', 1)
-#                         key = key.strip()
-#                         value = value.strip().strip('"').strip("'")
-#                         os.environ[key] = value
-#                         print(f"  Loaded: {key}")
-#                     except ValueError:
-#                         print(f"  Skipped malformed line {line_num}: {line}")
-#         print("Environment variables loaded successfully")
-#     else:
-#         print(f"No .env file found at {env_file.absolute()}")
-#         print("Please create a .env file in the project root with your credentials")
-
-# # Load environment variables
-# load_env_file()
+# Load credentials from the nearest .env (python-dotenv searches up from this file)
+load_dotenv()
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/automation.log'),
-        logging.StreamHandler()
-    ]
-)
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_file_handler = logging.handlers.RotatingFileHandler('logs/automation.log', maxBytes=50_000_000, backupCount=5)
+_stream_handler = logging.StreamHandler()
+for _handler in (_file_handler, _stream_handler):
+    _handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+# Log calls only enqueue the record; a background thread formats and writes it,
+# so disk I/O never runs on the event loop
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_log_listener = logging.handlers.QueueListener(_log_queue, _file_handler, _stream_handler, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+logging.root.setLevel(logging.INFO)
+logging.root.addHandler(logging.handlers.QueueHandler(_log_queue))
 logger = logging.getLogger(__name__)
 
 # Configuration
@@ -75,7 +72,13 @@ logger = logging.getLogger(__name__)
 class Config:
     # LLM Configuration
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
-    
+    openai_model: str = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    code_model: str = os.getenv("OPENAI_CODE_MODEL", "gpt-4o")  # JSX generation needs the stronger model
+    llm_concurrency: int = int(os.getenv("LLM_CONCURRENCY", "5"))  # Max in-flight OpenAI requests
+    agent_timeout: float = float(os.getenv("AGENT_TIMEOUT", "120"))  # Seconds before a pipeline agent is cancelled
+    llm_cache_dir: str = os.getenv("LLM_CACHE_DIR", "")  # Persist cached LLM responses here; empty = memory only
+    llm_batch_size: int = int(os.getenv("LLM_BATCH_SIZE", "0"))  # Files per combined LLM call (4-6 works well); 0 = one call per file
+
     # Jira Configuration
     jira_url: str = os.getenv("JIRA_URL", "")  # https://your-instance.atlassian.net
     jira_username: str = os.getenv("JIRA_USERNAME", "")  # your-email@company.com
@@ -94,6 +97,30 @@ class Config:
 
 config = Config()
 
+# One OpenAI client shared by every agent and webhook, on the same connection pool as
+# the Jira/GitHub calls; created on first use so processes that never call the LLM skip the import
+_openai_client = None
+
+def _get_openai_client():
+    """Return the shared AsyncOpenAI client, or None when the LLM is unavailable"""
+    global _openai_client
+    if _openai_client is None and LLM_AVAILABLE and config.openai_api_key:
+        import openai
+        _openai_client = openai.AsyncOpenAI(
+            api_key=config.openai_api_key,
+            max_retries=3,  # SDK backoff with jitter on 429/5xx/timeouts, honouring Retry-After
+            http_client=get_http_client()
+        )
+    return _openai_client
+
+# Deterministic code-generation completions, keyed by a digest of model + prompt
+_llm_cache = LLMCache(directory=config.llm_cache_dir or None)
+
+def close_openai_client():
+    """Drop the shared OpenAI client; its connections close with close_http_client()"""
+    global _openai_client
+    _openai_client = None
+
 # Data classes
 @dataclass
 class FileChange:
@@ -127,18 +154,182 @@ class AgentState(TypedDict):
 def generate_trace_id() -> str:
     return str(uuid.uuid4())
 
+def _now_iso() -> str:
+    """Current time as an ISO 8601 UTC timestamp (no local timezone lookup)"""
+    return datetime.fromtimestamp(time.time(), tz=timezone.utc).isoformat()
+
+# Template-analysis rules: feature -> (keywords, functional requirement, component).
+# Add a feature here and the keyword scan picks it up.
+_FEATURE_RULES: Dict[str, Tuple[Tuple[str, ...], str, str]] = {
+    "search": (("search", "filter"), "Add search functionality", "SearchBar.jsx"),
+    "category": (("category", "tag"), "Add category functionality", "CategorySelect.jsx"),
+}
+
+# All rule keywords in one pass, anywhere in a word like the old substring checks; the group name is the feature
+_KEYWORD_RE = re.compile(
+    "|".join(f"(?P<{feature}>{'|'.join(keywords)})" for feature, (keywords, _, _) in _FEATURE_RULES.items()),
+    re.IGNORECASE
+)
+
+# LLM responses sometimes wrap code in a markdown fence and/or lead with prose
+_FENCE_RE = re.compile(r"```[\w+-]*[ \t]*\n(.*?)(?:\n[ \t]*```|\Z)", re.S)
+_JS_START_RE = re.compile(r"^[ \t]*(?:import|const|function) ", re.M)
+_CSS_START_RE = re.compile(r"^[ \t]*(?:[.*@]|body)", re.M)
+
+
+def _clean_llm_code(raw: str, code_start: "re.Pattern" = _JS_START_RE) -> str:
+    """Extract the code from an LLM response: first fenced block, from the first code line"""
+    code = raw.strip()
+    if '```' in code:
+        fenced = _FENCE_RE.search(code)
+        if fenced:
+            code = fenced.group(1)
+    start = code_start.search(code)
+    if start:
+        code = code[start.start():]
+    return code.strip()
+
+
+class _FencedCodeStream:
+    """Pulls the first fenced code block out of streamed LLM text as it arrives.
+    
+    Text before the opening fence is held back; if no fence ever shows up the
+    whole response is returned, for _clean_llm_code to trim.
+    """
+    SEEKING_FENCE, IN_CODE, DONE = range(3)
+    
+    def __init__(self):
+        self.state = self.SEEKING_FENCE
+        self._pending = ""
+        self._preamble: List[str] = []
+        self._code: List[str] = []
+    
+    def feed(self, text: str) -> bool:
+        """Consume a delta; returns True once the closing fence has been seen"""
+        self._pending += text
+        while self.state != self.DONE and "\n" in self._pending:
+            line, self._pending = self._pending.split("\n", 1)
+            self._consume_line(line + "\n")
+        return self.state == self.DONE
+    
+    def _consume_line(self, line: str):
+        is_fence = line.lstrip().startswith("```")
+        if self.state == self.SEEKING_FENCE:
+            if is_fence:
+                self.state = self.IN_CODE
+            else:
+                self._preamble.append(line)
+        elif is_fence:
+            self.state = self.DONE
+        else:
+            self._code.append(line)
+    
+    def result(self) -> str:
+        if self.state != self.DONE and self._pending:
+            self._consume_line(self._pending)
+            self._pending = ""
+        if self.state == self.SEEKING_FENCE or not self._code:
+            return "".join(self._preamble)
+        return "".join(self._code)
+
+
+# Fallback code templates, read from disk once per process
+TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+
+
+# Component-name substring -> prebuilt fallback template; first match wins
+_COMPONENT_TEMPLATES = (
+    ("search", "advanced_search.jsx"),
+    ("advanced", "advanced_search.jsx"),
+    ("category", "category_filter.jsx"),
+)
+
+
+class _CodeTemplate(string.Template):
+    """string.Template with @@name placeholders, which can't clash with JS `${...}` or JSX braces"""
+    delimiter = "@@"
+
+
+@lru_cache(maxsize=None)
+def _load_template(name: str) -> _CodeTemplate:
+    """Template file from TEMPLATES_DIR, cached after the first read"""
+    return _CodeTemplate((TEMPLATES_DIR / name).read_text(encoding="utf-8"))
+
+
+RECENT_COMMENTS_SIZE = 256
+
+# Rate limits and transient server errors from Jira/GitHub are worth retrying
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# Non-idempotent requests (comments, transitions, ref/PR creation, mutations) may already
+# have taken effect after a 5xx or a read timeout, so they are only retried when the
+# request provably never reached the server: rate limited, or failed while connecting
+UNSENT_STATUS = {429}
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Upper bound on a server-requested Retry-After wait
+MAX_RETRY_AFTER = 30
+
+# GitHub responses kept for conditional (If-None-Match) revalidation
+ETAG_CACHE_SIZE = 256
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Delay requested by a 429/503 Retry-After header, if it is given in seconds"""
+    value = response.headers.get("Retry-After")
+    if value and value.strip().isdigit():
+        return min(float(value), MAX_RETRY_AFTER)
+    return None
+
+# Per-request timeout for Jira/GitHub calls (the shared pool's default is sized for LLM calls)
+API_TIMEOUT = 30.0
+
+async def _request(method: str, url: str, idempotent: Optional[bool] = None, **kwargs) -> httpx.Response:
+    """Send an API request, retrying with backoff.
+    
+    Idempotent requests (GET by default) retry any transport error and retryable
+    status; others only retry when the server cannot have acted on them.
+    """
+    kwargs.setdefault("timeout", API_TIMEOUT)
+    if idempotent is None:
+        idempotent = method == "GET"
+    statuses = RETRYABLE_STATUS if idempotent else UNSENT_STATUS
+    
+    async def attempt():
+        return await get_http_client().request(method, url, **kwargs)
+    
+    return await retry_async(
+        attempt,
+        retry_on=(httpx.TransportError,) if idempotent else UNSENT_ERRORS,
+        retry_if=lambda response: response.status_code in statuses,
+        retry_after=_retry_after_seconds
+    )
+
 class JiraClient:
     """Production Jira API client"""
     
+    # Transition IDs keyed by (project key, lowercased target status)
+    _transition_ids: Dict[Tuple[str, str], str] = {}
+    
+    # Recently posted (issue_key, hash(comment)) pairs, so retried webhooks don't repeat comments
+    _recent_comments: "OrderedDict[Tuple[str, int], None]" = OrderedDict()
+    
     def __init__(self):
         if not all([config.jira_url, config.jira_username, config.jira_api_token]):
             logger.warning("Jira credentials not fully configured")
             self.enabled = False
         else:
             self.enabled = True
-            self.auth = base64.b64encode(
-                f"{config.jira_username}:{config.jira_api_token}".encode()
-            ).decode()
+    
+    @cached_property
+    def headers(self) -> Dict[str, str]:
+        """Request headers, built on first API call"""
+        auth = base64.b64encode(
+            f"{config.jira_username}:{config.jira_api_token}".encode()
+        ).decode()
+        return {
+            "Authorization": f"Basic {auth}",
+            "Content-Type": "application/json"
+        }
     
     async def update_issue_status(self, issue_key: str, status: str, comment: str) -> bool:
         """Update Jira issue status and add comment"""
@@ -147,45 +338,44 @@ class JiraClient:
             return True
         
         try:
-            # Get available transitions
             transitions_url = f"{config.jira_url}/rest/api/2/issue/{issue_key}/transitions"
-            headers = {
-                "Authorization": f"Basic {self.auth}",
-                "Content-Type": "application/json"
-            }
             
-            response = requests.get(transitions_url, headers=headers)
-            if response.status_code != 200:
-                logger.error(f"Failed to get transitions: {response.text}")
-                return False
-            
-            transitions = response.json()["transitions"]
-            target_transition = None
-            
-            # Find transition to target status
-            for transition in transitions:
-                if transition["to"]["name"].lower() == status.lower():
-                    target_transition = transition["id"]
-                    break
-            
-            if not target_transition:
-                logger.warning(f"No transition found to status: {status}")
-                # Just add comment without status change
-                return await self.add_comment(issue_key, comment)
+            # Transition IDs are stable per workflow, so cache them by project and target status
+            cache_key = (issue_key.split('-')[0], status.lower())
+            target_transition = self._transition_ids.get(cache_key)
+            cached = target_transition is not None
             
-            # Execute transition with comment
-            transition_payload = {
-                "transition": {"id": target_transition},
-                "update": {
-                    "comment": [{"add": {"body": comment}}]
-                }
-            }
+            if not cached:
+                # Get available transitions
+                response = await _request("GET", transitions_url, headers=self.headers)
+                if response.status_code != 200:
+                    logger.error(f"Failed to get transitions: {response.text}")
+                    return False
+                
+                transitions = json_loads(response.content)["transitions"]
+                
+                # Find transition to target status
+                for transition in transitions:
+                    if transition["to"]["name"].lower() == status.lower():
+                        target_transition = transition["id"]
+                        break
+                
+                if not target_transition:
+                    logger.warning(f"No transition found to status: {status}")
+                    # Just add comment without status change
+                    return await self.add_comment(issue_key, comment)
+                
+                self._transition_ids[cache_key] = target_transition
             
-            response = requests.post(transitions_url, json=transition_payload, headers=headers)
+            response = await self.transition_with_comment(issue_key, target_transition, comment)
             
             if response.status_code == 204:
                 logger.info(f"Successfully updated {issue_key} to {status}")
                 return True
+            elif cached and response.status_code in (400, 404, 409):
+                # Stale entry (workflow changed or transition unavailable from this status): refetch once
+                self._transition_ids.pop(cache_key, None)
+                return await self.update_issue_status(issue_key, status, comment)
             else:
                 logger.error(f"Failed to transition issue: {response.text}")
                 return False
@@ -194,24 +384,38 @@ class JiraClient:
             logger.error(f"Jira API error: {e}")
             return False
     
+    async def transition_with_comment(self, issue_key: str, transition_id: str, comment: str) -> httpx.Response:
+        """Apply a transition and add a comment in a single POST (204 on success)"""
+        transitions_url = f"{config.jira_url}/rest/api/2/issue/{issue_key}/transitions"
+        payload = {
+            "transition": {"id": transition_id},
+            "update": {
+                "comment": [{"add": {"body": comment}}]
+            }
+        }
+        return await _request("POST", transitions_url, content=json_dumps(payload), headers=self.headers)
+    
     async def add_comment(self, issue_key: str, comment: str) -> bool:
         """Add comment to Jira issue"""
         if not self.enabled:
             logger.info(f"Jira disabled - would comment on {issue_key}")
             return True
         
+        comment_key = (issue_key, hash(comment))
+        if comment_key in self._recent_comments:
+            logger.info(f"Skipping duplicate comment on {issue_key}")
+            return True
+        
         try:
             comment_url = f"{config.jira_url}/rest/api/2/issue/{issue_key}/comment"
-            headers = {
-                "Authorization": f"Basic {self.auth}",
-                "Content-Type": "application/json"
-            }
-            
             payload = {"body": comment}
-            response = requests.post(comment_url, json=payload, headers=headers)
+            response = await _request("POST", comment_url, content=json_dumps(payload), headers=self.headers)
             
             if response.status_code == 201:
                 logger.info(f"Comment added to {issue_key}")
+                self._recent_comments[comment_key] = None
+                if len(self._recent_comments) > RECENT_COMMENTS_SIZE:
+                    self._recent_comments.popitem(last=False)
                 return True
             else:
                 logger.error(f"Failed to add comment: {response.text}")
@@ -221,47 +425,95 @@ class JiraClient:
             logger.error(f"Failed to add Jira comment: {e}")
             return False
 
+# Shared Jira client; stateless apart from its configured credentials
+_jira_client = JiraClient()
+
 class GitHubClient:
     """Production GitHub API client"""
     
+    # GraphQL repository node IDs, keyed by "owner/name"
+    _repository_ids: Dict[str, str] = {}
+    
+    # (ETag, parsed body) of recent GETs, keyed by URL. Conditional GETs
+    # answered with 304 don't count against the rate limit.
+    _etag_cache: "OrderedDict[str, Tuple[str, Any]]" = OrderedDict()
+    
     def __init__(self):
         if not all([config.github_token, config.github_repo]):
             logger.warning("GitHub credentials not configured")
             self.enabled = False
         else:
             self.enabled = True
-            self.headers = {
-                "Authorization": f"token {config.github_token}",
-                "Accept": "application/vnd.github.v3+json"
-            }
     
-    async def create_branch(self, branch_name: str, base_branch: str = None) -> bool:
-        """Create new branch on GitHub"""
+    @cached_property
+    def headers(self) -> Dict[str, str]:
+        """Request headers, built on first API call"""
+        return {
+            "Authorization": f"token {config.github_token}",
+            "Accept": "application/vnd.github.v3+json",
+            "Content-Type": "application/json"
+        }
+    
+    async def _cached_get(self, url: str) -> Tuple[int, Any]:
+        """GET a GitHub resource, revalidating any cached copy with If-None-Match
+        
+        Returns (status, parsed JSON body); a 304 is reported as 200 with the
+        cached body, and failures return the response text as the body.
+        """
+        cached = self._etag_cache.get(url)
+        
+        headers = self.headers
+        if cached:
+            headers = {**self.headers, "If-None-Match": cached[0]}
+        response = await _request("GET", url, headers=headers)
+        
+        if response.status_code == 304 and cached:
+            self._etag_cache.move_to_end(url)
+            return 200, cached[1]
+        
+        if response.status_code != 200:
+            return response.status_code, response.text
+        
+        body = json_loads(response.content)
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etag_cache[url] = (etag, body)
+            self._etag_cache.move_to_end(url)
+            if len(self._etag_cache) > ETAG_CACHE_SIZE:
+                self._etag_cache.popitem(last=False)
+        return 200, body
+    
+    async def get_branch_sha(self, branch: str) -> Optional[str]:
+        """Return the head commit SHA of a branch"""
+        ref_url = f"https://api.github.com/repos/{config.github_repo}/git/ref/heads/{branch}"
+        status, body = await self._cached_get(ref_url)
+        
+        if status != 200:
+            logger.error(f"Failed to get branch {branch}: {body}")
+            return None
+        
+        return body["object"]["sha"]
+    
+    async def create_branch(self, branch_name: str, base_branch: str = None, sha: str = None) -> bool:
+        """Create new branch on GitHub, at `sha` or at the head of the base branch"""
         if not self.enabled:
             logger.info(f"GitHub disabled - would create branch {branch_name}")
             return True
         
         try:
-            base_branch = base_branch or config.github_base_branch
-            
-            # Get base branch SHA
-            ref_url = f"https://api.github.com/repos/{config.github_repo}/git/ref/heads/{base_branch}"
-            response = requests.get(ref_url, headers=self.headers)
-            
-            if response.status_code != 200:
-                logger.error(f"Failed to get base branch: {response.text}")
-                return False
-            
-            base_sha = response.json()["object"]["sha"]
+            if not sha:
+                sha = await self.get_branch_sha(base_branch or config.github_base_branch)
+                if not sha:
+                    return False
             
             # Create new branch
             create_ref_url = f"https://api.github.com/repos/{config.github_repo}/git/refs"
             payload = {
                 "ref": f"refs/heads/{branch_name}",
-                "sha": base_sha
+                "sha": sha
             }
             
-            response = requests.post(create_ref_url, json=payload, headers=self.headers)
+            response = await _request("POST", create_ref_url, content=json_dumps(payload), headers=self.headers)
             
             if response.status_code == 201:
                 logger.info(f"Created GitHub branch: {branch_name}")
@@ -274,6 +526,179 @@ class GitHubClient:
             logger.error(f"GitHub branch creation error: {e}")
             return False
     
+    async def commit_files(self, files: Dict[str, str], message: str, parent_sha: str) -> Optional[Tuple[str, Set[str]]]:
+        """Create a single commit with the given files on top of parent_sha.
+        
+        Uses the Git Data API with inline blob content, so the whole change set
+        costs one tree and one commit request regardless of the number of files.
+        Returns the commit SHA and the subset of `files` that already existed
+        in the base tree (i.e. were modified rather than created).
+        """
+        if not self.enabled:
+            logger.info(f"GitHub disabled - would commit {len(files)} files")
+            return None
+        
+        try:
+            api_url = f"https://api.github.com/repos/{config.github_repo}/git"
+            
+            repo_paths = {
+                file_path: Path(os.path.relpath(file_path, config.project_root)).as_posix()
+                for file_path in files
+            }
+            
+            # Commits are immutable, so repeat lookups of the same base revalidate for free
+            (status, body), existing_paths = await asyncio.gather(
+                self._cached_get(f"{api_url}/commits/{parent_sha}"),
+                self._existing_paths(parent_sha, list(repo_paths.values()))
+            )
+            if status != 200:
+                logger.error(f"Failed to get base commit: {body}")
+                return None
+            base_tree = body["tree"]["sha"]
+            existing = {file_path for file_path, repo_path in repo_paths.items() if repo_path in existing_paths}
+            
+            tree_payload = {
+                "base_tree": base_tree,
+                "tree": [
+                    {
+                        "path": repo_paths[file_path],
+                        "mode": "100644",
+                        "type": "blob",
+                        "content": content
+                    }
+                    for file_path, content in files.items()
+                ]
+            }
+            response = await _request("POST", f"{api_url}/trees", content=json_dumps(tree_payload), headers=self.headers)
+            if response.status_code != 201:
+                logger.error(f"Failed to create tree: {response.text}")
+                return None
+            
+            commit_payload = {
+                "message": message,
+                "tree": json_loads(response.content)["sha"],
+                "parents": [parent_sha]
+            }
+            if config.jira_username:
+                commit_payload["author"] = {"name": "DevOps Automation", "email": config.jira_username}
+            
+            response = await _request("POST", f"{api_url}/commits", content=json_dumps(commit_payload), headers=self.headers)
+            if response.status_code != 201:
+                logger.error(f"Failed to create commit: {response.text}")
+                return None
+            
+            commit_sha = json_loads(response.content)["sha"]
+            logger.info(f"Created GitHub commit {commit_sha[:8]} with {len(files)} files")
+            return commit_sha, existing
+            
+        except Exception as e:
+            logger.error(f"GitHub commit error: {e}")
+            return None
+    
+    async def _existing_paths(self, commit_sha: str, paths: List[str]) -> Set[str]:
+        """Return which of `paths` exist at commit_sha, resolved in one GraphQL query"""
+        owner, name = config.github_repo.split("/", 1)
+        variables = {"owner": owner, "name": name}
+        for index, path in enumerate(paths):
+            variables[f"e{index}"] = f"{commit_sha}:{path}"
+        
+        declarations = "".join(f", $e{index}: String!" for index in range(len(paths)))
+        fields = " ".join(f"p{index}: object(expression: $e{index}) {{ oid }}" for index in range(len(paths)))
+        data = await self._graphql(
+            f"query($owner: String!, $name: String!{declarations}) "
+            f"{{ repository(owner: $owner, name: $name) {{ {fields} }} }}",
+            variables
+        )
+        if not data or not data.get("repository"):
+            logger.warning("Could not look up existing files; reporting all of them as created")
+            return set()
+        
+        return {path for index, path in enumerate(paths) if data["repository"].get(f"p{index}")}
+    
+    async def _get_repository_id(self) -> Optional[str]:
+        """Return the GraphQL node ID of the configured repository (cached per process)"""
+        repository_id = GitHubClient._repository_ids.get(config.github_repo)
+        if repository_id:
+            return repository_id
+        
+        owner, name = config.github_repo.split("/", 1)
+        data = await self._graphql(
+            "query($owner: String!, $name: String!) { repository(owner: $owner, name: $name) { id } }",
+            {"owner": owner, "name": name}
+        )
+        repository_id = ((data or {}).get("repository") or {}).get("id")
+        if repository_id:
+            GitHubClient._repository_ids[config.github_repo] = repository_id
+        return repository_id
+    
+    async def _graphql(self, query: str, variables: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Run a GraphQL document and return its data, logging any errors"""
+        response = await _request(
+            "POST",
+            "https://api.github.com/graphql",
+            idempotent=query.lstrip().startswith("query"),
+            content=json_dumps({"query": query, "variables": variables}),
+            headers=self.headers
+        )
+        if response.status_code != 200:
+            logger.error(f"GitHub GraphQL request failed: {response.text}")
+            return None
+        
+        result = json_loads(response.content)
+        if result.get("errors"):
+            logger.error(f"GitHub GraphQL errors: {result['errors']}")
+        return result.get("data")
+    
+    async def open_feature_pr(self, branch_name: str, commit_sha: str, title: str, description: str) -> Optional[str]:
+        """Create the feature branch at commit_sha and open its pull request in one GraphQL call.
+        
+        Falls back to the REST endpoints for whatever the mutation did not complete.
+        """
+        if not self.enabled:
+            logger.info(f"GitHub disabled - would create branch and PR for {branch_name}")
+            return f"https://github.com/{config.github_repo}/pulls"
+        
+        try:
+            repository_id = await self._get_repository_id()
+            data = repository_id and await self._graphql(
+                """
+                mutation($repositoryId: ID!, $ref: String!, $oid: GitObjectID!,
+                         $base: String!, $head: String!, $title: String!, $body: String!) {
+                  createRef(input: {repositoryId: $repositoryId, name: $ref, oid: $oid}) {
+                    ref { name }
+                  }
+                  createPullRequest(input: {repositoryId: $repositoryId, baseRefName: $base,
+                                            headRefName: $head, title: $title, body: $body}) {
+                    pullRequest { url }
+                  }
+                }
+                """,
+                {
+                    "repositoryId": repository_id,
+                    "ref": f"refs/heads/{branch_name}",
+                    "oid": commit_sha,
+                    "base": config.github_base_branch,
+                    "head": branch_name,
+                    "title": title,
+                    "body": description
+                }
+            )
+            
+            pull_request = ((data or {}).get("createPullRequest") or {}).get("pullRequest")
+            if pull_request:
+                logger.info(f"Created branch {branch_name} and PR: {pull_request['url']}")
+                return pull_request["url"]
+            
+        except Exception as e:
+            logger.error(f"GitHub branch/PR creation error: {e}")
+            data = None
+        
+        logger.warning(f"GraphQL branch/PR creation failed for {branch_name}, falling back to REST")
+        ref_created = bool(((data or {}).get("createRef") or {}).get("ref"))
+        if not ref_created and not await self.create_branch(branch_name, sha=commit_sha):
+            return None
+        return await self.create_pull_request(branch_name, title, description)
+    
     async def create_pull_request(self, branch_name: str, title: str, description: str) -> Optional[str]:
         """Create pull request and return URL"""
         if not self.enabled:
@@ -289,10 +714,10 @@ class GitHubClient:
                 "body": description
             }
             
-            response = requests.post(pr_url, json=payload, headers=self.headers)
+            response = await _request("POST", pr_url, content=json_dumps(payload), headers=self.headers)
             
             if response.status_code == 201:
-                pr_data = response.json()
+                pr_data = json_loads(response.content)
                 logger.info(f"Created PR: {pr_data['html_url']}")
                 return pr_data["html_url"]
             else:
@@ -306,25 +731,44 @@ class GitHubClient:
 class GitOperations:
     """Local Git operations"""
     
+    # GitPython repositories, opened once and reused across webhooks, keyed by project root
+    _repos: Dict[str, Any] = {}
+    
     @staticmethod
-    def run_git_command(command: List[str], cwd: str = None) -> tuple[bool, str]:
-        """Run git command and return success status and output"""
-        try:
-            result = subprocess.run(
-                command,
-                cwd=cwd or config.project_root,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return True, result.stdout.strip()
-        except subprocess.CalledProcessError as e:
-            return False, e.stderr.strip()
+    def _repo():
+        """The repository containing the project root, opened on first use"""
+        repo = GitOperations._repos.get(config.project_root)
+        if repo is None:
+            repo = git.Repo(config.project_root, search_parent_directories=True)
+            GitOperations._repos[config.project_root] = repo
+        return repo
+    
+    @staticmethod
+    async def run_git_command(command: List[str], cwd: str = None) -> tuple[bool, str]:
+        """Run git command and return success status and output, without blocking the event loop"""
+        proc = await asyncio.create_subprocess_exec(
+            *command,
+            cwd=cwd or config.project_root,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await proc.communicate()
+        if proc.returncode == 0:
+            return True, stdout.decode().strip()
+        return False, stderr.decode().strip()
     
     @staticmethod
     async def create_and_checkout_branch(branch_name: str) -> bool:
         """Create and checkout new local branch"""
-        success, output = GitOperations.run_git_command(['git', 'checkout', '-b', branch_name])
+        if GIT_AVAILABLE:
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, GitOperations._checkout_in_process, branch_name)
+                success, output = True, ""
+            except Exception as e:
+                success, output = False, str(e)
+        else:
+            success, output = await GitOperations.run_git_command(['git', 'checkout', '-b', branch_name])
         if success:
             logger.info(f"Created and checked out branch: {branch_name}")
         else:
@@ -332,10 +776,23 @@ class GitOperations:
         return success
     
     @staticmethod
-    async def commit_changes(message: str, author_email: str = None) -> tuple[bool, str]:
-        """Stage and commit all changes"""
-        # Stage all changes
-        success, output = GitOperations.run_git_command(['git', 'add', '.'])
+    async def commit_changes(message: str, author_email: str = None, paths: Optional[List[str]] = None) -> tuple[bool, str]:
+        """Stage and commit `paths` (all changes if None), returning the commit hash"""
+        if paths is not None and not paths:
+            return False, "Nothing to commit"
+        
+        if GIT_AVAILABLE:
+            loop = asyncio.get_running_loop()
+            try:
+                commit_hash = await loop.run_in_executor(
+                    None, GitOperations._commit_in_process, message, author_email, paths
+                )
+                return True, commit_hash
+            except Exception as e:
+                return False, f"Failed to commit: {e}"
+        
+        # Stage changes
+        success, output = await GitOperations.run_git_command(['git', 'add', '--'] + (paths or ['.']))
         if not success:
             return False, f"Failed to stage changes: {output}"
         
@@ -344,60 +801,101 @@ class GitOperations:
         if author_email:
             commit_cmd.extend(['--author', f"DevOps Automation <{author_email}>"])
         
-        success, output = GitOperations.run_git_command(commit_cmd)
+        success, output = await GitOperations.run_git_command(commit_cmd)
         if success:
             # Get commit hash
-            success_hash, commit_hash = GitOperations.run_git_command(['git', 'rev-parse', 'HEAD'])
+            success_hash, commit_hash = await GitOperations.run_git_command(['git', 'rev-parse', 'HEAD'])
             return True, commit_hash if success_hash else "unknown"
         else:
             return False, f"Failed to commit: {output}"
     
+    @staticmethod
+    def _checkout_in_process(branch_name: str):
+        """Blocking GitPython branch creation, run in the executor"""
+        GitOperations._repo().create_head(branch_name).checkout()
+    
+    @staticmethod
+    def _commit_in_process(message: str, author_email: Optional[str], paths: Optional[List[str]]) -> str:
+        """Blocking GitPython commit, run in the executor"""
+        repo = GitOperations._repo()
+        if paths is None:
+            repo.git.add(A=True)
+        else:
+            repo.index.add([os.path.abspath(path) for path in paths])
+        
+        author = git.Actor("DevOps Automation", author_email) if author_email else None
+        return repo.index.commit(message, author=author).hexsha
+    
     @staticmethod
     async def push_branch(branch_name: str) -> bool:
         """Push branch to origin"""
-        success, output = GitOperations.run_git_command(['git', 'push', 'origin', branch_name])
+        success, output = await GitOperations.run_git_command(['git', 'push', 'origin', branch_name])
         if success:
             logger.info(f"Pushed branch: {branch_name}")
         else:
             logger.error(f"Failed to push branch: {output}")
         return success
 
+# Max backup/write syscalls in flight in the thread pool at once
+DISK_CONCURRENCY = 8
+
 class FileManager:
     """Enhanced file manager with Git integration"""
     
     @staticmethod
-    def create_backup(file_path: str, trace_id: str) -> str:
+    async def create_backup(file_path: str, trace_id: str, sem: Optional[asyncio.Semaphore] = None) -> str:
         """Create backup of existing file"""
         if not os.path.exists(file_path):
             return ""
-            
-        backup_dir = Path(f"../backups/{trace_id}")
-        backup_dir.mkdir(parents=True, exist_ok=True)
         
+        sem = sem or asyncio.Semaphore(DISK_CONCURRENCY)
+        loop = asyncio.get_running_loop()
+        async with sem:
+            backup_path = await loop.run_in_executor(None, FileManager._copy_to_backup, file_path, trace_id)
+        
+        logger.info(f"Backup created: {file_path} -> {backup_path}")
+        return backup_path
+    
+    @staticmethod
+    def _copy_to_backup(file_path: str, trace_id: str) -> str:
+        """Blocking part of create_backup, run in the executor"""
+        backup_dir = Path(f"../backups/{trace_id}")
         relative_path = Path(file_path).relative_to(Path(".."))
         backup_path = backup_dir / relative_path
         backup_path.parent.mkdir(parents=True, exist_ok=True)
         
-        shutil.copy2(file_path, backup_path)
-        logger.info(f"Backup created: {file_path} -> {backup_path}")
+        # Hardlink instead of copying; safe because writes replace the file rather
+        # than truncating it, so the backup keeps the original inode and content
+        try:
+            os.link(file_path, backup_path)
+        except OSError:
+            # Cross-device, unsupported filesystem or existing backup
+            shutil.copy2(file_path, backup_path)
         return str(backup_path)
     
     @staticmethod
-    def write_file(file_path: str, content: str, trace_id: str) -> FileChange:
+    async def write_file(file_path: str, content: str, trace_id: str, sem: Optional[asyncio.Semaphore] = None) -> FileChange:
         """Write file with backup"""
         file_path_obj = Path(file_path)
         action = "modified" if file_path_obj.exists() else "created"
+        sem = sem or asyncio.Semaphore(DISK_CONCURRENCY)
+        
+        loop = asyncio.get_running_loop()
         
         backup_path = ""
         if action == "modified":
-            backup_path = FileManager.create_backup(file_path, trace_id)
-        
-        file_path_obj.parent.mkdir(parents=True, exist_ok=True)
+            async with sem:
+                unchanged = await loop.run_in_executor(None, FileManager._has_content, file_path_obj, content)
+            if unchanged:
+                logger.info(f"File unchanged: {file_path}")
+                return FileChange(file=file_path, action="unchanged")
+            
+            backup_path = await FileManager.create_backup(file_path, trace_id, sem)
         
-        with open(file_path_obj, 'w', encoding='utf-8') as f:
-            f.write(content)
+        async with sem:
+            await loop.run_in_executor(None, atomic_write_text, file_path_obj, content)
         
-        lines_added = len(content.split('\n'))
+        lines_added = count_lines(content)
         logger.info(f"File {action}: {file_path} ({lines_added} lines)")
         
         return FileChange(
@@ -406,19 +904,27 @@ class FileManager:
             lines_added=lines_added,
             backup_path=backup_path
         )
+    
+    @staticmethod
+    def _has_content(file_path: Path, content: str) -> bool:
+        """True if the file already holds exactly this content"""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return f.read() == content
+        except (OSError, UnicodeDecodeError):
+            return False
 
 # Agent implementations (using previous code generation logic)
 class RequirementsAnalyst:
     """AI-powered requirements analysis"""
     
-    def __init__(self):
-        if LLM_AVAILABLE and config.openai_api_key:
-            self.client = openai.AsyncOpenAI(api_key=config.openai_api_key)
-        else:
-            self.client = None
+    @cached_property
+    def client(self):
+        """Shared OpenAI client (None without an API key), created on first use"""
+        return _get_openai_client()
     
     async def __call__(self, state: AgentState) -> AgentState:
-        logger.info(f"[{state['trace_id']}] Analyzing requirements")
+        logger.info("[%s] Analyzing requirements", state['trace_id'])
         
         try:
             if self.client:
@@ -437,6 +943,19 @@ class RequirementsAnalyst:
     
     async def _llm_analysis(self, state: AgentState):
         """LLM-powered analysis (previous implementation)"""
+        llm_analysis = await self._request_llm_analysis(state)
+
+        return {
+            "functional": list(llm_analysis.get("functional_requirements", [])),
+            "technical": list(llm_analysis.get("technical_requirements", [])),
+            "priority": llm_analysis.get("priority", "medium"),
+            "files_to_modify": [f"{config.frontend_path}/{f}" for f in llm_analysis.get("files_to_modify", [])],
+            "components_to_create": [f"{config.frontend_path}/src/components/{c}" for c in llm_analysis.get("components_to_create", [])],
+            "ai_analysis": True
+        }
+
+    async def _request_llm_analysis(self, state: AgentState) -> Dict[str, Any]:
+        """Ask the LLM for the raw requirements JSON; Jira retries and duplicate tickets hit the LLM cache"""
         analysis_prompt = f"""
         Analyze this Jira ticket and extract technical requirements for a React todo application:
         
@@ -454,30 +973,35 @@ class RequirementsAnalyst:
         }}
         """
         
-        response = await self.client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are a software architect. Return only valid JSON."},
-                {"role": "user", "content": analysis_prompt}
-            ],
-            temperature=0.1,
-            max_tokens=1000
-        )
-        
-        llm_analysis = json.loads(response.choices[0].message.content)
+        messages = [
+            {"role": "system", "content": "You are a software architect. Return only valid JSON."},
+            {"role": "user", "content": analysis_prompt}
+        ]
         
-        return {
-            "functional": llm_analysis.get("functional_requirements", []),
-            "technical": llm_analysis.get("technical_requirements", []),
-            "priority": llm_analysis.get("priority", "medium"),
-            "files_to_modify": [f"{config.frontend_path}/{f}" for f in llm_analysis.get("files_to_modify", [])],
-            "components_to_create": [f"{config.frontend_path}/src/components/{c}" for c in llm_analysis.get("components_to_create", [])],
-            "ai_analysis": True
-        }
+        async def complete() -> str:
+            response = await self.client.chat.completions.create(
+                model=config.openai_model,
+                messages=messages,
+                temperature=0.1,
+                max_tokens=1000,
+                response_format={"type": "json_object"}
+            )
+            content = response.choices[0].message.content
+            # Never cache a malformed response
+            if not isinstance(json_loads(content), dict):
+                raise ValueError("requirements analysis is not a JSON object")
+            return content
+        
+        key = cache_key(config.openai_model, messages, temperature=0.1, max_tokens=1000, response_format="json_object")
+        return json_loads(await _llm_cache.get_or_create(key, complete))
     
     def _template_analysis(self, state: AgentState):
         """Template-based analysis fallback"""
-        description = state['issue_description'].lower()
+        features = set()
+        for match in _KEYWORD_RE.finditer(state['issue_description']):
+            features.add(match.lastgroup)
+            if len(features) == len(_FEATURE_RULES):
+                break
         
         requirements = {
             "functional": [],
@@ -488,62 +1012,175 @@ class RequirementsAnalyst:
             "ai_analysis": False
         }
         
-        if "search" in description or "filter" in description:
-            requirements["functional"].append("Add search functionality")
-            requirements["files_to_modify"].extend([
-                f"{config.frontend_path}/src/App.jsx",
-                f"{config.frontend_path}/src/App.css"
-            ])
-            requirements["components_to_create"].append(f"{config.frontend_path}/src/components/SearchBar.jsx")
-        
-        if "category" in description or "tag" in description:
-            requirements["functional"].append("Add category functionality")
+        for feature, (_, functional, component) in _FEATURE_RULES.items():
+            if feature not in features:
+                continue
+            requirements["functional"].append(functional)
             requirements["files_to_modify"].extend([
                 f"{config.frontend_path}/src/App.jsx",
                 f"{config.frontend_path}/src/App.css"
             ])
-            requirements["components_to_create"].append(f"{config.frontend_path}/src/components/CategorySelect.jsx")
+            requirements["components_to_create"].append(f"{config.frontend_path}/src/components/{component}")
         
         return requirements
 
+# Code-generation prompts, built once; only the ticket details vary per call
+_REACT_SYSTEM_PROMPT = "You are an expert React developer. Return ONLY clean JavaScript code with no explanations or markdown."
+_CSS_SYSTEM_PROMPT = "You are an expert CSS developer. Return ONLY clean CSS code with no explanations or markdown."
+
+_COMPONENT_PROMPT = string.Template("""\
+Generate a React functional component for: $component_name
+
+"CRITICAL: Only use React built-in functionality. Do not import external libraries like react-datepicker, react-notification-system, date-fns, etc. Use standard HTML elements and built-in React hooks only."
+"Use modern React 18 compatible libraries only. For notifications, use react-hot-toast instead of react-notification-system. Prefer built-in HTML elements when possible."
+# In your code generation prompts, add these constraints:
+
+CRITICAL CONSTRAINTS:
+1. Use ONLY React built-in hooks (useState, useEffect)
+2. Use ONLY standard HTML elements (input, button, div, etc.)
+3. Do NOT import external libraries
+4. Do NOT use date pickers, notification systems, or complex UI libraries
+5. Keep all functionality simple and self-contained
+6. Preserve existing working code structure
+
+
+Context:
+- Feature: $summary
+- Description: $description
+
+IMPORTANT: Return ONLY the JavaScript/JSX code, no explanations, no markdown formatting.
+Start directly with 'import' and end with 'export default ComponentName;'
+
+Create a production-ready React component that:
+1. Uses modern React hooks (useState, useEffect as needed)
+2. Includes proper event handling
+3. Has accessible design
+4. Follows React best practices
+""")
+
+_APP_PROMPT = string.Template("""\
+Update this React App component to implement: $summary
+
+Description: $description
+Components available: $components
+
+Current App.jsx:
+$existing_content
+
+IMPORTANT: Return ONLY the complete JavaScript/JSX code, no explanations, no markdown formatting.
+Start directly with 'import' statements and end with 'export default App'
+
+Please:
+1. Add the new functionality while preserving existing features
+2. Import any new components needed
+3. Add necessary state management
+4. Include proper error handling
+""")
+
+_CSS_PROMPT = string.Template("""\
+Generate CSS styles for a React todo application with this new feature: $summary
+
+Description: $description
+New Components: $components
+
+IMPORTANT: Return ONLY the CSS code, no explanations, no markdown formatting, no code blocks.
+Start directly with CSS selectors and rules.
+
+Create modern, responsive CSS that includes:
+1. Base styles for the todo application
+2. Styles for the new functionality
+3. Responsive design
+4. Accessibility improvements
+5. Modern visual design
+""")
+
+
 class CodeGenerator:
     """Code generation with LLM/template hybrid approach"""
     
-    def __init__(self):
-        if LLM_AVAILABLE and config.openai_api_key:
-            self.client = openai.AsyncOpenAI(api_key=config.openai_api_key)
-        else:
-            self.client = None
+    # Output token budget per file kind in a batched call
+    BATCH_MAX_TOKENS = {"component": 2000, "app": 3000, "css": 1500}
+    
+    def __init__(self, file_sink: Optional[Callable[[str, str, str], Awaitable[None]]] = None):
+        # Receives (file_path, content, trace_id) as soon as each file is generated
+        self.file_sink = file_sink
+    
+    @cached_property
+    def client(self):
+        """OpenAI client, or None to fall back to templates"""
+        return _get_openai_client()
     
     async def __call__(self, state: AgentState) -> AgentState:
-        logger.info(f"[{state['trace_id']}] Generating code")
+        logger.info("[%s] Generating code", state['trace_id'])
         
         try:
             requirements = state['requirements']
             generated_code = {}
-            
-            # Generate components (using previous implementation)
+            state['generated_code'] = generated_code
+            semaphore = asyncio.Semaphore(config.llm_concurrency)
+
+            batch_size = config.llm_batch_size if self.client else 0
+
+            async def produce(file_path, coro):
+                async with semaphore:
+                    try:
+                        return [(file_path, await coro, None)]
+                    except Exception as e:
+                        return [(file_path, None, e)]
+
+            async def produce_batch(files):
+                async with semaphore:
+                    try:
+                        generated = await self._batch_llm_generate(files, state)
+                    except Exception as e:
+                        return [(file_path, None, e) for file_path in files]
+                    return [(file_path, code, None) for file_path, code in generated.items()]
+
+            # Collect every file to generate so the LLM calls run concurrently;
+            # with batching on, LLM files are grouped by kind into `batched` instead
+            targets = {}
+            batched = {}
             for component_path in requirements.get('components_to_create', []):
                 component_name = component_path.split('/')[-1].replace('.jsx', '')
-                
-                if self.client:
-                    code = await self._generate_component_with_llm(component_name, state)
-                else:
+
+                if not self.client:
                     code = self._generate_component_template(component_name, state['issue_description'])
-                
-                generated_code[component_path] = code
-            
+                    await self._emit(component_path, code, state)
+                elif batch_size > 1:
+                    batched[component_path] = "component"
+                else:
+                    targets[component_path] = self._generate_component_with_llm(component_name, state)
+
             # Update existing files
             for file_path in requirements.get('files_to_modify', []):
+                if file_path in targets or file_path in batched:
+                    continue
                 if "App.jsx" in file_path:
-                    updated_code = await self._update_app_file(file_path, state)
-                    generated_code[file_path] = updated_code
+                    if batch_size > 1:
+                        batched[file_path] = "app"
+                    else:
+                        targets[file_path] = self._update_app_file(file_path, state)
                 elif "App.css" in file_path:
-                    updated_css = await self._update_css_file(state)
-                    generated_code[file_path] = updated_css
-            
-            state['generated_code'] = generated_code
-            logger.info(f"[{state['trace_id']}] Generated {len(generated_code)} files")
+                    if batch_size > 1:
+                        batched[file_path] = "css"
+                    else:
+                        targets[file_path] = self._update_css_file(state)
+
+            jobs = [produce(p, c) for p, c in targets.items()]
+            batched_paths = list(batched)
+            for i in range(0, len(batched_paths), max(batch_size, 1)):
+                jobs.append(produce_batch({p: batched[p] for p in batched_paths[i:i + batch_size]}))
+
+            # Hand each file downstream as soon as it lands
+            for next_done in asyncio.as_completed(jobs):
+                for file_path, code, error in await next_done:
+                    if error is not None:
+                        logger.error(f"Code generation failed for {file_path}: {error}")
+                        state['errors'].append(f"Code generation error: {str(error)}")
+                    else:
+                        await self._emit(file_path, code, state)
+
+            logger.info("[%s] Generated %s files", state['trace_id'], len(generated_code))
             
         except Exception as e:
             logger.error(f"Code generation failed: {e}")
@@ -551,99 +1188,176 @@ class CodeGenerator:
         
         return state
     
-    async def _generate_component_with_llm(self, component_name: str, state: AgentState) -> str:
-            """Generate React component using LLM"""
-            prompt = f"""
-            Generate a React functional component for: {component_name}
-            
-            "CRITICAL: Only use React built-in functionality. Do not import external libraries like react-datepicker, react-notification-system, date-fns, etc. Use standard HTML elements and built-in React hooks only."
-            "Use modern React 18 compatible libraries only. For notifications, use react-hot-toast instead of react-notification-system. Prefer built-in HTML elements when possible."
-            # In your code generation prompts, add these constraints:
-            
-            CRITICAL CONSTRAINTS:
-            1. Use ONLY React built-in hooks (useState, useEffect)
-            2. Use ONLY standard HTML elements (input, button, div, etc.)
-            3. Do NOT import external libraries
-            4. Do NOT use date pickers, notification systems, or complex UI libraries
-            5. Keep all functionality simple and self-contained
-            6. Preserve existing working code structure
-            
-            
-            Context:
-            - Feature: {state['issue_summary']}
-            - Description: {state['issue_description']}
-            
-            IMPORTANT: Return ONLY the JavaScript/JSX code, no explanations, no markdown formatting.
-            Start directly with 'import' and end with 'export default ComponentName;'
-            
-            Create a production-ready React component that:
-            1. Uses modern React hooks (useState, useEffect as needed)
-            2. Includes proper event handling
-            3. Has accessible design
-            4. Follows React best practices
-            """
-            
+    async def _emit(self, file_path: str, code: str, state: AgentState):
+        """Record a generated file and pass it to the sink, if any"""
+        state['generated_code'][file_path] = code
+        if self.file_sink:
+            await self.file_sink(file_path, code, state['trace_id'])
+    
+    async def _stream_completion(self, model: str, system: str, prompt: str, max_tokens: int, temperature: float = 0.0) -> str:
+        """Stream a chat completion and return the code in it.
+        
+        Deterministic (temperature 0) completions are answered from the LLM cache
+        when the same prompt has been seen before.
+        """
+        messages = [
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt}
+        ]
+        
+        async def complete() -> str:
+            stream = await self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            code = _FencedCodeStream()
             try:
-                response = await self.client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {"role": "system", "content": "You are an expert React developer. Return ONLY clean JavaScript code with no explanations or markdown."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.1,
-                    max_tokens=2000
+                async for chunk in stream:
+                    if chunk.choices and code.feed(chunk.choices[0].delta.content or ""):
+                        break  # Closing fence seen - don't wait for trailing prose
+            finally:
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    await close()
+            return code.result()
+        
+        async def complete_with_retry() -> str:
+            # The SDK retries the request itself; this covers a connection dropped mid-stream
+            return await retry_async(complete, retry_on=(httpx.TransportError,))
+        
+        if temperature > 0:
+            return await complete_with_retry()
+        return await _llm_cache.get_or_create(cache_key(model, messages, max_tokens=max_tokens), complete_with_retry)
+    
+    async def _batch_llm_generate(self, files: Dict[str, str], state: AgentState) -> Dict[str, str]:
+        """Generate several files with one JSON-mode LLM call.
+        
+        `files` maps each path to its kind ("component", "app" or "css"). Files the
+        model leaves out, or all of them if the call fails, fall back to templates.
+        """
+        components = [c.split('/')[-1].replace('.jsx', '') for c in state['requirements'].get('components_to_create', [])]
+        file_specs = []
+        for file_path, kind in files.items():
+            if kind == "component":
+                name = file_path.split('/')[-1].replace('.jsx', '')
+                file_specs.append(f"- {file_path}: React functional component {name}, ending with 'export default {name};'")
+            elif kind == "app":
+                existing_content = self._read_existing(file_path)
+                file_specs.append(
+                    f"- {file_path}: the App component, updated to add the feature while preserving existing features. "
+                    f"Current content:\n{existing_content[:2000] if existing_content else 'No existing content'}"
                 )
-                
-                # Clean the response to remove any markdown or explanations
-                code = response.choices[0].message.content.strip()
-                
-                # Remove markdown code blocks if present
-                if code.startswith('```'):
-                    lines = code.split('\n')
-                    start_idx = 0
-                    for i, line in enumerate(lines):
-                        if not line.strip().startswith('```') and not line.strip() in ['jsx', 'javascript', 'js']:
-                            start_idx = i
-                            break
-                    
-                    end_idx = len(lines)
-                    for i in range(len(lines) - 1, -1, -1):
-                        if not lines[i].strip().startswith('```'):
-                            end_idx = i + 1
-                            break
-                    
-                    code = '\n'.join(lines[start_idx:end_idx])
-                
-                # Remove any explanatory text before import statements
-                lines = code.split('\n')
-                code_start = 0
-                for i, line in enumerate(lines):
-                    if line.strip().startswith('import ') or line.strip().startswith('const ') or line.strip().startswith('function '):
-                        code_start = i
-                        break
-                
-                code = '\n'.join(lines[code_start:])
-                return code.strip()
-                
-            except Exception as e:
-                logger.error(f"LLM component generation failed: {e}")
-                return self._generate_component_template(component_name, state['issue_description'])
+            else:
+                file_specs.append(f"- {file_path}: CSS styles for the new feature and components, responsive and accessible")
+        file_list = "\n".join(file_specs)
+        
+        prompt = f"""
+        Generate these files for a React todo application implementing: {state['issue_summary']}
+        
+        Description: {state['issue_description']}
+        New components: {components}
+        
+        CRITICAL CONSTRAINTS:
+        1. Use ONLY React built-in hooks (useState, useEffect)
+        2. Use ONLY standard HTML elements (input, button, div, etc.)
+        3. Do NOT import external libraries
+        
+        Files:
+{file_list}
+        
+        Return a JSON object mapping each file path above to its complete file content, with no markdown.
+        """
+        
+        messages = [
+            {"role": "system", "content": "You are an expert React developer. Return only valid JSON."},
+            {"role": "user", "content": prompt}
+        ]
+        max_tokens = sum(self.BATCH_MAX_TOKENS[kind] for kind in files.values())
+        
+        async def complete() -> str:
+            response = await self.client.chat.completions.create(
+                model=config.code_model,
+                messages=messages,
+                temperature=0,
+                max_tokens=max_tokens,
+                response_format={"type": "json_object"}
+            )
+            content = response.choices[0].message.content
+            # Never cache a malformed response
+            if not isinstance(json_loads(content), dict):
+                raise ValueError("batched response is not a JSON object")
+            return content
+        
+        generated = {}
+        try:
+            key = cache_key(config.code_model, messages, max_tokens=max_tokens, response_format="json_object")
+            generated = json_loads(await _llm_cache.get_or_create(key, complete))
+        except Exception as e:
+            logger.error(f"Batched LLM generation failed: {e}")
+        if not isinstance(generated, dict):
+            logger.error(f"Batched LLM response is a {type(generated).__name__}, not an object")
+            generated = {}
+        
+        results = {}
+        for file_path, kind in files.items():
+            code = generated.get(file_path)
+            if not isinstance(code, str) or not code.strip():
+                logger.warning(f"No LLM output for {file_path}, using template")
+                if kind == "component":
+                    code = self._generate_component_template(file_path.split('/')[-1].replace('.jsx', ''), state['issue_description'])
+                elif kind == "app":
+                    code = self._generate_updated_app_template(state)
+                else:
+                    code = self._generate_updated_styles_template(state)
+            elif kind == "css":
+                code = _clean_llm_code(code, _CSS_START_RE)
+            else:
+                code = _clean_llm_code(code)
+            results[file_path] = code
+        return results
+    
+    async def _generate_component_with_llm(self, component_name: str, state: AgentState) -> str:
+        """Generate React component using LLM; identical tickets are answered from the LLM cache"""
+        try:
+            return await self._request_component_code(component_name, state)
+        except Exception as e:
+            logger.error(f"LLM component generation failed: {e}")
+            return self._generate_component_template(component_name, state['issue_description'])
+    
+    async def _request_component_code(self, component_name: str, state: AgentState) -> str:
+        """Ask the LLM for a component's code"""
+        prompt = _COMPONENT_PROMPT.substitute(
+            component_name=component_name,
+            summary=state['issue_summary'],
+            description=state['issue_description']
+        )
+        
+        raw = await self._stream_completion(config.code_model, _REACT_SYSTEM_PROMPT, prompt, max_tokens=2000)
+        
+        return _clean_llm_code(raw)
     
     def _generate_component_template(self, component_name: str, description: str) -> str:
         """Generate component using templates (previous implementation)"""
         # Implementation from previous version
         pass
     
-    async def _update_app_file(self, file_path: str, state: AgentState) -> str:
-        """Update App.jsx file"""
-        # Read existing App.jsx content
-        existing_content = ""
+    @staticmethod
+    def _read_existing(file_path: str) -> str:
+        """Current content of a file being updated, or "" if it can't be read"""
         try:
             if os.path.exists(file_path):
                 with open(file_path, 'r', encoding='utf-8') as f:
-                    existing_content = f.read()
+                    return f.read()
         except:
             pass
+        return ""
+    
+    async def _update_app_file(self, file_path: str, state: AgentState) -> str:
+        """Update App.jsx file"""
+        existing_content = self._read_existing(file_path)
         
         if self.client:
             return await self._update_app_with_llm(file_path, state, existing_content)
@@ -657,65 +1371,17 @@ class CodeGenerator:
       
     async def _update_app_with_llm(self, file_path: str, state: AgentState, existing_content: str) -> str:
         """Update App.jsx using LLM"""
-        prompt = f"""
-        Update this React App component to implement: {state['issue_summary']}
-        
-        Description: {state['issue_description']}
-        Components available: {[c.split('/')[-1].replace('.jsx', '') for c in state['requirements'].get('components_to_create', [])]}
-        
-        Current App.jsx:
-        {existing_content[:2000] if existing_content else "No existing content"}
-        
-        IMPORTANT: Return ONLY the complete JavaScript/JSX code, no explanations, no markdown formatting.
-        Start directly with 'import' statements and end with 'export default App'
-        
-        Please:
-        1. Add the new functionality while preserving existing features
-        2. Import any new components needed
-        3. Add necessary state management
-        4. Include proper error handling
-        """
+        prompt = _APP_PROMPT.substitute(
+            summary=state['issue_summary'],
+            description=state['issue_description'],
+            components=[c.split('/')[-1].replace('.jsx', '') for c in state['requirements'].get('components_to_create', [])],
+            existing_content=existing_content[:2000] if existing_content else "No existing content"
+        )
         
         try:
-            response = await self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert React developer. Return ONLY clean JavaScript code with no explanations or markdown."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                max_tokens=3000
-            )
-            
-            # Clean the response
-            code = response.choices[0].message.content.strip()
+            raw = await self._stream_completion(config.code_model, _REACT_SYSTEM_PROMPT, prompt, max_tokens=3000)
             
-            # Remove markdown code blocks if present
-            if code.startswith('```') or '```jsx' in code or '```javascript' in code:
-                lines = code.split('\n')
-                clean_lines = []
-                in_code_block = False
-                
-                for line in lines:
-                    if line.strip().startswith('```'):
-                        in_code_block = not in_code_block
-                        continue
-                    
-                    if in_code_block or (not line.strip().startswith('Here') and not line.strip().startswith('This')):
-                        clean_lines.append(line)
-                
-                code = '\n'.join(clean_lines)
-            
-            # Remove explanatory text
-            lines = code.split('\n')
-            code_start = 0
-            for i, line in enumerate(lines):
-                if line.strip().startswith('import ') or line.strip().startswith('const ') or line.strip().startswith('function '):
-                    code_start = i
-                    break
-            
-            code = '\n'.join(lines[code_start:])
-            return code.strip()
+            return _clean_llm_code(raw)
             
         except Exception as e:
             logger.error(f"LLM App update failed: {e}")
@@ -730,63 +1396,16 @@ class CodeGenerator:
 
     async def _update_css_with_llm(self, state: AgentState) -> str:
         """Update CSS using LLM"""
-        prompt = f"""
-        Generate CSS styles for a React todo application with this new feature: {state['issue_summary']}
-        
-        Description: {state['issue_description']}
-        New Components: {[c.split('/')[-1].replace('.jsx', '') for c in state['requirements'].get('components_to_create', [])]}
-        
-        IMPORTANT: Return ONLY the CSS code, no explanations, no markdown formatting, no code blocks.
-        Start directly with CSS selectors and rules.
-        
-        Create modern, responsive CSS that includes:
-        1. Base styles for the todo application
-        2. Styles for the new functionality
-        3. Responsive design
-        4. Accessibility improvements
-        5. Modern visual design
-        """
+        prompt = _CSS_PROMPT.substitute(
+            summary=state['issue_summary'],
+            description=state['issue_description'],
+            components=[c.split('/')[-1].replace('.jsx', '') for c in state['requirements'].get('components_to_create', [])]
+        )
         
         try:
-            response = await self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert CSS developer. Return ONLY clean CSS code with no explanations or markdown."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                max_tokens=2000
-            )
+            raw = await self._stream_completion(config.openai_model, _CSS_SYSTEM_PROMPT, prompt, max_tokens=1500)
             
-            # Clean the response
-            code = response.choices[0].message.content.strip()
-            
-            # Remove markdown code blocks if present
-            if code.startswith('```') or '```css' in code:
-                lines = code.split('\n')
-                clean_lines = []
-                in_code_block = False
-                
-                for line in lines:
-                    if line.strip().startswith('```'):
-                        in_code_block = not in_code_block
-                        continue
-                    
-                    if in_code_block or (not line.strip().startswith('This') and not line.strip().startswith('Here')):
-                        clean_lines.append(line)
-                
-                code = '\n'.join(clean_lines)
-            
-            # Remove explanatory text
-            lines = code.split('\n')
-            code_start = 0
-            for i, line in enumerate(lines):
-                if line.strip().startswith('.') or line.strip().startswith('*') or line.strip().startswith('body') or line.strip().startswith('@'):
-                    code_start = i
-                    break
-            
-            code = '\n'.join(lines[code_start:])
-            return code.strip()
+            return _clean_llm_code(raw, _CSS_START_RE)
             
         except Exception as e:
             logger.error(f"LLM CSS update failed: {e}")
@@ -794,107 +1413,16 @@ class CodeGenerator:
     
     def _generate_component_template(self, component_name: str, description: str):
         """Fallback template generation"""
-        if "search" in component_name.lower() or "advanced" in component_name.lower():
-            return '''import React, { useState } from 'react';
-
-const AdvancedSearch = ({ onSearch, onFilterChange }) => {
-  const [searchTerm, setSearchTerm] = useState('');
-  const [filters, setFilters] = useState({
-    category: 'all',
-    priority: 'all',
-    status: 'all'
-  });
-
-  const handleSearchChange = (value) => {
-    setSearchTerm(value);
-    onSearch(value, filters);
-  };
-
-  const handleFilterChange = (filterType, value) => {
-    const newFilters = { ...filters, [filterType]: value };
-    setFilters(newFilters);
-    onFilterChange(newFilters);
-  };
-
-  return (
-    <div className="advanced-search">
-      <div className="search-input-container">
-        <input
-          type="text"
-          placeholder="Search todos..."
-          value={searchTerm}
-          onChange={(e) => handleSearchChange(e.target.value)}
-          className="search-input"
-        />
-      </div>
-      <div className="filters">
-        <select
-          value={filters.category}
-          onChange={(e) => handleFilterChange('category', e.target.value)}
-          className="filter-select"
-        >
-          <option value="all">All Categories</option>
-          <option value="work">Work</option>
-          <option value="personal">Personal</option>
-          <option value="shopping">Shopping</option>
-        </select>
-        <select
-          value={filters.priority}
-          onChange={(e) => handleFilterChange('priority', e.target.value)}
-          className="filter-select"
-        >
-          <option value="all">All Priorities</option>
-          <option value="high">High</option>
-          <option value="medium">Medium</option>
-          <option value="low">Low</option>
-        </select>
-      </div>
-    </div>
-  );
-};
-
-export default AdvancedSearch;'''
-        
-        elif "category" in component_name.lower():
-            return '''import React from 'react';
-
-const CategoryFilter = ({ selectedCategory, onCategoryChange }) => {
-  const categories = ['all', 'work', 'personal', 'shopping', 'health'];
-  
-  return (
-    <div className="category-filter">
-      <label htmlFor="category-select">Filter by Category:</label>
-      <select 
-        id="category-select"
-        value={selectedCategory}
-        onChange={(e) => onCategoryChange(e.target.value)}
-        className="category-select"
-      >
-        {categories.map(category => (
-          <option key={category} value={category}>
-            {category.charAt(0).toUpperCase() + category.slice(1)}
-          </option>
-        ))}
-      </select>
-    </div>
-  );
-};
-
-export default CategoryFilter;'''
-        
-        else:
-            return f'''import React from 'react';
-
-const {component_name} = () => {{
-  return (
-    <div className="{component_name.lower().replace('_', '-')}">
-      <h3>{component_name}</h3>
-      <p>Generated component for: {description[:100]}...</p>
-    </div>
-  );
-}};
-
-export default {component_name};'''
+        lower_name = component_name.lower()
+        template_name = next((name for key, name in _COMPONENT_TEMPLATES if key in lower_name), None)
+        if template_name:
+            return _load_template(template_name).template
+        
+        return _load_template("component.jsx").substitute(
+            component_name=component_name,
+            css_class=lower_name.replace('_', '-'),
+            description=description[:100]
+        )
     
     def _generate_updated_app_template(self, state: AgentState) -> str:
         """Generate updated App.jsx using templates"""
@@ -906,8 +1434,12 @@ export default {component_name};'''
         component_usage = []
         state_additions = []
         
-        for component_path in requirements.get('components_to_create', []):
-            component_name = component_path.split('/')[-1].replace('.jsx', '')
+        # Analyses can list the same component twice; a duplicate import breaks the build
+        component_names = dict.fromkeys(
+            component_path.rsplit('/', 1)[-1].removesuffix('.jsx')
+            for component_path in requirements.get('components_to_create', ())
+        )
+        for component_name in component_names:
             components_to_import.append(f"import {component_name} from './components/{component_name}'")
             
             if 'search' in component_name.lower() or 'advanced' in component_name.lower():
@@ -923,289 +1455,15 @@ export default {component_name};'''
         additional_state = '\n'.join(state_additions)
         component_sections = '\n'.join(component_usage)
         
-        return f'''import {{ useState, useEffect }} from 'react'
-{import_statements}
-import './App.css'
-
-function App() {{
-  const [todos, setTodos] = useState([])
-  const [loading, setLoading] = useState(true)
-  const [newTodo, setNewTodo] = useState('')
-{additional_state}
-
-  useEffect(() => {{
-    fetchTodos()
-  }}, [])
-
-  const fetchTodos = async () => {{
-    try {{
-      const response = await fetch('http://localhost:3001/api/todos')
-      const data = await response.json()
-      setTodos(data)
-    }} catch (error) {{
-      console.error('Failed to fetch todos:', error)
-    }} finally {{
-      setLoading(false)
-    }}
-  }}
-
-  const addTodo = async () => {{
-    if (!newTodo.trim()) return
-    
-    try {{
-      const response = await fetch('http://localhost:3001/api/todos', {{
-        method: 'POST',
-        headers: {{
-          'Content-Type': 'application/json',
-        }},
-        body: JSON.stringify({{ title: newTodo, priority: 'medium' }}),
-      }})
-      
-      if (response.ok) {{
-        const todo = await response.json()
-        setTodos([todo, ...todos])
-        setNewTodo('')
-      }}
-    }} catch (error) {{
-      console.error('Failed to add todo:', error)
-    }}
-  }}
-
-  const toggleTodo = async (id, completed) => {{
-    try {{
-      const response = await fetch(`http://localhost:3001/api/todos/${{id}}`, {{
-        method: 'PUT',
-        headers: {{
-          'Content-Type': 'application/json',
-        }},
-        body: JSON.stringify({{ completed }}),
-      }})
-      
-      if (response.ok) {{
-        const updatedTodo = await response.json()
-        setTodos(todos.map(todo => 
-          todo.id === id ? updatedTodo : todo
-        ))
-      }}
-    }} catch (error) {{
-      console.error('Failed to update todo:', error)
-    }}
-  }}
-
-  if (loading) {{
-    return <div className="loading">Loading todos...</div>
-  }}
-
-  return (
-    <div className="app">
-      <header className="header">
-        <h1>Todo App</h1>
-        <p>Enhanced with automation</p>
-      </header>
-      
-      <main className="main-content">
-        <div className="add-todo">
-          <input
-            type="text"
-            value={{newTodo}}
-            onChange={{(e) => setNewTodo(e.target.value)}}
-            placeholder="What needs to be done?"
-            onKeyPress={{(e) => e.key === 'Enter' && addTodo()}}
-          />
-          <button onClick={{addTodo}}>Add Todo</button>
-        </div>
-{component_sections}
-        
-        <div className="todos">
-          {{todos.map(todo => (
-            <div key={{todo.id}} className={{`todo-item ${{todo.completed ? 'completed' : ''}} priority-${{todo.priority}}`}}>
-              <input
-                type="checkbox"
-                checked={{todo.completed}}
-                onChange={{(e) => toggleTodo(todo.id, e.target.checked)}}
-              />
-              <div className="todo-content">
-                <span className="todo-title">{{todo.title}}</span>
-                <div className="todo-meta">
-                  <span className="priority">{{todo.priority}}</span>
-                  <span className="date">{{new Date(todo.created_at).toLocaleDateString()}}</span>
-                </div>
-              </div>
-            </div>
-          ))}}
-        </div>
-        
-        {{todos.length === 0 && (
-          <div className="empty-state">
-            <p>No todos yet. Add one above!</p>
-          </div>
-        )}}
-      </main>
-    </div>
-  )
-}}
-
-export default App'''
+        return _load_template("App.jsx").substitute(
+            import_statements=import_statements,
+            additional_state=additional_state,
+            component_sections=component_sections
+        )
     
     def _generate_updated_styles_template(self, state: AgentState) -> str:
         """Generate updated CSS using templates"""
-        return '''* {
-  margin: 0;
-  padding: 0;
-  box-sizing: border-box;
-}
-
-body {
-  font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-  background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-  min-height: 100vh;
-  color: #333;
-}
-
-.app {
-  min-height: 100vh;
-  padding: 20px;
-}
-
-.header {
-  text-align: center;
-  color: white;
-  margin-bottom: 30px;
-}
-
-.header h1 {
-  font-size: 2.5rem;
-  margin-bottom: 10px;
-  text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-}
-
-.main-content {
-  max-width: 800px;
-  margin: 0 auto;
-  background: white;
-  border-radius: 12px;
-  padding: 30px;
-  box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-}
-
-.add-todo {
-  display: flex;
-  gap: 10px;
-  margin-bottom: 20px;
-}
-
-.add-todo input {
-  flex: 1;
-  padding: 12px;
-  border: 2px solid #e9ecef;
-  border-radius: 6px;
-  font-size: 16px;
-}
-
-.add-todo button {
-  padding: 12px 24px;
-  background: #667eea;
-  color: white;
-  border: none;
-  border-radius: 6px;
-  cursor: pointer;
-  font-weight: 600;
-}
-
-.search-section, .advanced-search {
-  margin-bottom: 20px;
-  padding: 15px;
-  background: #f8f9fa;
-  border-radius: 8px;
-}
-
-.search-input {
-  width: 100%;
-  padding: 12px;
-  border: 2px solid #e9ecef;
-  border-radius: 6px;
-  font-size: 16px;
-  margin-bottom: 10px;
-}
-
-.filters {
-  display: flex;
-  gap: 10px;
-  flex-wrap: wrap;
-}
-
-.filter-select, .category-select {
-  padding: 8px 12px;
-  border: 2px solid #e9ecef;
-  border-radius: 6px;
-  font-size: 14px;
-  background: white;
-}
-
-.todos {
-  display: flex;
-  flex-direction: column;
-  gap: 12px;
-}
-
-.todo-item {
-  display: flex;
-  align-items: center;
-  gap: 12px;
-  padding: 16px;
-  border: 2px solid #e9ecef;
-  border-radius: 8px;
-  background: white;
-}
-
-.todo-item.priority-high {
-  border-left: 6px solid #dc3545;
-}
-
-.todo-item.priority-medium {
-  border-left: 6px solid #ffc107;
-}
-
-.todo-item.priority-low {
-  border-left: 6px solid #28a745;
-}
-
-.todo-content {
-  flex: 1;
-}
-
-.todo-title {
-  font-weight: 600;
-  margin-bottom: 4px;
-}
-
-.todo-meta {
-  display: flex;
-  gap: 8px;
-  font-size: 12px;
-}
-
-.priority, .date {
-  padding: 2px 6px;
-  border-radius: 10px;
-  background: #e2e8f0;
-  color: #4a5568;
-}
-
-.empty-state {
-  text-align: center;
-  padding: 40px 20px;
-  color: #718096;
-}
-
-.loading {
-  display: flex;
-  justify-content: center;
-  align-items: center;
-  height: 100vh;
-  font-size: 18px;
-  color: white;
-}'''
+        return _load_template("App.css").template
 
 
 
@@ -1213,89 +1471,147 @@ body {
 class ProductionGitIntegrator:
     """Production Git integration with GitHub sync"""
     
+    PR_CREATED_COMMENT = (
+        "🚀 Pull Request Created\n\n"
+        "[View Pull Request|{url}]\n\n"
+        "**Files Modified:**\n"
+        "{files}\n"
+        "**Commit:** `{sha}`"
+    )
+    
+    PR_DESCRIPTION = (
+        "## {issue_key}: {issue_summary}\n\n"
+        "**Issue Type:** {issue_type}\n\n"
+        "### Description\n{issue_description}\n\n"
+        "{features}"
+        "{files}"
+        "### Generation Method\n"
+        "{method}\n\n"
+        "### Automation Details\n"
+        "- **Trace ID:** `{trace_id}`\n"
+        "- **Generated:** {generated}\n"
+        "- **Commit:** `{commit}`\n\n"
+        "### Testing Checklist\n"
+        "- [ ] Feature works as expected\n"
+        "- [ ] No existing functionality broken\n"
+        "- [ ] UI/UX is consistent\n"
+        "- [ ] No console errors\n"
+        "- [ ] Mobile responsive (if applicable)\n\n"
+        "*This pull request was automatically generated by the DevOps Automation System*"
+    )
+    
     def __init__(self):
         self.github_client = GitHubClient()
-        self.jira_client = JiraClient()
+        self.jira_client = _jira_client
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._queued_paths = set()
+        self._branch_ready = False
     
-    async def __call__(self, state: AgentState) -> AgentState:
-        logger.info(f"[{state['trace_id']}] Starting production Git integration")
+    @property
+    def file_sink(self) -> Optional[Callable[[str, str, str], Awaitable[None]]]:
+        """Sink for CodeGenerator so local writes overlap with code generation"""
+        return None if self.github_client.enabled else self.enqueue_file
+    
+    async def enqueue_file(self, file_path: str, content: str, trace_id: str):
+        """Queue a generated file for the background writer, starting it on first use"""
+        if self._writer_task is None:
+            self._write_queue = asyncio.Queue()
+            self._writer_task = asyncio.create_task(self._consume(self._write_queue, trace_id))
+        self._queued_paths.add(file_path)
+        await self._write_queue.put((file_path, content))
+    
+    async def _consume(self, queue: asyncio.Queue, trace_id: str) -> List[Tuple[str, Any]]:
+        """Start a write for each queued file until the sentinel arrives"""
+        sem = asyncio.Semaphore(DISK_CONCURRENCY)
+        paths, writes = [], []
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            file_path, content = item
+            paths.append(file_path)
+            writes.append(asyncio.ensure_future(FileManager.write_file(file_path, content, trace_id, sem)))
+        
+        results = await asyncio.gather(*writes, return_exceptions=True)
+        return list(zip(paths, results))
+    
+    async def _drain_writes(self) -> List[Tuple[str, Any]]:
+        """Stop the background writer and return (file_path, FileChange or exception) pairs"""
+        if self._writer_task is None:
+            return []
+        
+        await self._write_queue.put(None)
+        results = await self._writer_task
+        self._write_queue = self._writer_task = None
+        self._queued_paths = set()
+        return results
+    
+    async def start_development(self, state: AgentState) -> AgentState:
+        """Name the feature branch, move the Jira issue to In Progress and set up the branch.
         
-        try:
-            # Generate branch name
-            timestamp = int(time.time())
-            state['branch_name'] = f"feature/{state['issue_key'].lower()}-{timestamp}"
-            
-            # Update Jira: Starting development
-            await self.jira_client.update_issue_status(
+        Needs only the issue key, so it runs alongside code generation.
+        """
+        timestamp = int(time.time())
+        state['branch_name'] = f"feature/{state['issue_key'].lower()}-{timestamp}"
+        
+        await asyncio.gather(
+            self.jira_client.update_issue_status(
                 state['issue_key'],
                 "In Progress",
-                f"🤖 Automation started\\n\\nBranch: `{state['branch_name']}`\\nTrace ID: `{state['trace_id']}`"
-            )
-            
-            # Create GitHub branch first
-            await self.github_client.create_branch(state['branch_name'])
-            
-            # Create and checkout local branch
-            await GitOperations.create_and_checkout_branch(state['branch_name'])
+                f"🤖 Automation started\n\nBranch: `{state['branch_name']}`\nTrace ID: `{state['trace_id']}`"
+            ),
+            self._prepare_branch(state)
+        )
+        return state
+    
+    async def _prepare_branch(self, state: AgentState):
+        """Create the remote and local feature branch for a local-git publish.
+        
+        The GitHub API path creates its branch together with the PR, so there is
+        nothing to prepare there.
+        """
+        if self.github_client.enabled or self._branch_ready:
+            return
+        self._branch_ready = True
+        await self.github_client.create_branch(state['branch_name'])
+        await GitOperations.create_and_checkout_branch(state['branch_name'])
+    
+    async def __call__(self, state: AgentState) -> AgentState:
+        logger.info("[%s] Starting production Git integration", state['trace_id'])
+        
+        try:
+            if not state['branch_name']:
+                await self.start_development(state)
             
-            # Write generated files
-            file_changes = []
             generated_files = state.get('generated_code', {})
+            commit_message = f"{state['issue_key']}: {state['issue_summary']}\n\nAutomated implementation:\n"
+            commit_message += "\n".join([f"- {req}" for req in state['requirements'].get('functional', [])])
+            commit_message += f"\n\nGenerated by DevOps Automation\nTrace ID: {state['trace_id']}"
             
-            for file_path, content in generated_files.items():
-                try:
-                    file_change = FileManager.write_file(file_path, content, state['trace_id'])
-                    file_changes.append(file_change)
-                except Exception as e:
-                    logger.error(f"Failed to write {file_path}: {e}")
-                    state['errors'].append(f"File write error: {str(e)}")
-            
-            state['file_changes'] = file_changes
+            if self.github_client.enabled:
+                # Commit server-side through the GitHub API, no local clone/commit/push
+                pr_url = await self._publish_via_github(state, generated_files, commit_message)
+            else:
+                pr_url = await self._publish_locally(state, generated_files, commit_message)
             
-            if file_changes:
-                # Commit changes
-                commit_message = f"{state['issue_key']}: {state['issue_summary']}\n\nAutomated implementation:\n"
-                commit_message += "\n".join([f"- {req}" for req in state['requirements'].get('functional', [])])
-                commit_message += f"\n\nGenerated by DevOps Automation\nTrace ID: {state['trace_id']}"
+            if pr_url:
+                state['pr_url'] = pr_url
                 
-                success, commit_hash = await GitOperations.commit_changes(
-                    commit_message,
-                    config.jira_username
+                # Update Jira with PR link
+                jira_comment = self.PR_CREATED_COMMENT.format(
+                    url=pr_url,
+                    files="".join(f"• {c.file} ({c.action})\n" for c in state['file_changes']),
+                    sha=state['commit_hash'][:8]
                 )
                 
-                if success:
-                    state['commit_hash'] = commit_hash
-                    
-                    # Push to GitHub
-                    if await GitOperations.push_branch(state['branch_name']):
-                        # Create pull request
-                        pr_title = f"{state['issue_key']}: {state['issue_summary']}"
-                        pr_description = self._generate_pr_description(state)
-                        
-                        pr_url = await self.github_client.create_pull_request(
-                            state['branch_name'],
-                            pr_title,
-                            pr_description
-                        )
-                        
-                        if pr_url:
-                            state['pr_url'] = pr_url
-                            
-                            # Update Jira with PR link
-                            jira_comment = f"🚀 Pull Request Created\\n\\n"
-                            jira_comment += f"[View Pull Request|{pr_url}]\\n\\n"
-                            jira_comment += f"**Files Modified:**\\n"
-                            for change in file_changes:
-                                jira_comment += f"• {change.file} ({change.action})\\n"
-                            jira_comment += f"\\n**Commit:** `{commit_hash[:8]}`"
-                            
-                            await self.jira_client.update_issue_status(
-                                state['issue_key'],
-                                "Code Review",
-                                jira_comment
-                            )
+                await self.jira_client.update_issue_status(
+                    state['issue_key'],
+                    "Code Review",
+                    jira_comment
+                )
                 
-            logger.info(f"[{state['trace_id']}] Git integration completed")
+            logger.info("[%s] Git integration completed", state['trace_id'])
             
         except Exception as e:
             logger.error(f"Git integration failed: {e}")
@@ -1304,50 +1620,225 @@ class ProductionGitIntegrator:
             # Update Jira about failure
             await self.jira_client.add_comment(
                 state['issue_key'],
-                f"❌ Automation failed\\n\\nError: {str(e)}\\nTrace ID: `{state['trace_id']}`"
+                f"❌ Automation failed\n\nError: {str(e)}\nTrace ID: `{state['trace_id']}`"
             )
+        finally:
+            # Never leave the background writer pending
+            await self._drain_writes()
         
         return state
     
-    def _generate_pr_description(self, state: AgentState) -> str:
-        """Generate detailed PR description"""
-        description = f"## {state['issue_key']}: {state['issue_summary']}\n\n"
-        description += f"**Issue Type:** {state['issue_type']}\n\n"
-        description += f"### Description\n{state['issue_description']}\n\n"
+    async def _publish_via_github(self, state: AgentState, generated_files: Dict[str, str], commit_message: str) -> Optional[str]:
+        """Commit all generated files server-side, then create the branch and PR in one request"""
+        state['file_changes'] = []
+        if not generated_files:
+            return None
         
-        requirements = state['requirements']
-        if requirements.get('functional'):
-            description += "### Implemented Features\n"
-            for req in requirements['functional']:
-                description += f"- {req}\n"
-            description += "\n"
+        base_sha = await self.github_client.get_branch_sha(config.github_base_branch)
+        if not base_sha:
+            state['errors'].append("GitHub error: could not resolve base branch")
+            return None
         
-        if state['file_changes']:
-            description += "### Files Changed\n"
-            for change in state['file_changes']:
-                description += f"- `{change.file}` ({change.action}, {change.lines_added} lines)\n"
-            description += "\n"
+        committed = await self.github_client.commit_files(generated_files, commit_message, base_sha)
+        if not committed:
+            state['errors'].append("GitHub error: failed to create commit")
+            return None
+        
+        commit_hash, existing = committed
+        state['commit_hash'] = commit_hash
+        state['file_changes'] = [
+            FileChange(
+                file=file_path,
+                action="modified" if file_path in existing else "created",
+                lines_added=count_lines(content)
+            )
+            for file_path, content in generated_files.items()
+        ]
+        
+        pr_url = await self.github_client.open_feature_pr(
+            state['branch_name'],
+            commit_hash,
+            f"{state['issue_key']}: {state['issue_summary']}",
+            self._generate_pr_description(state)
+        )
+        if not pr_url:
+            state['errors'].append("GitHub error: failed to create branch and pull request")
+        return pr_url
+    
+    async def _publish_locally(self, state: AgentState, generated_files: Dict[str, str], commit_message: str) -> Optional[str]:
+        """Write files into the working tree, commit and push with git, then open the PR"""
+        # Usually already done by start_development while code was being generated
+        await self._prepare_branch(state)
+        
+        # Queue anything the code generator did not already stream to the writer
+        file_changes = []
+        for file_path, content in generated_files.items():
+            if file_path not in self._queued_paths:
+                await self.enqueue_file(file_path, content, state['trace_id'])
+        
+        for file_path, result in await self._drain_writes():
+            if isinstance(result, Exception):
+                logger.error(f"Failed to write {file_path}: {result}")
+                state['errors'].append(f"File write error: {str(result)}")
+            else:
+                file_changes.append(result)
         
-        ai_powered = requirements.get('ai_analysis', False)
-        description += f"### Generation Method\n"
-        description += f"{'🧠 AI-powered analysis' if ai_powered else '📋 Template-based generation'}\n\n"
+        state['file_changes'] = file_changes
+        if not file_changes:
+            return None
         
-        description += f"### Automation Details\n"
-        description += f"- **Trace ID:** `{state['trace_id']}`\n"
-        description += f"- **Generated:** {datetime.now().isoformat()}\n"
-        description += f"- **Commit:** `{state.get('commit_hash', 'N/A')}`\n\n"
+        success, commit_hash = await GitOperations.commit_changes(
+            commit_message,
+            config.jira_username,
+            [change.file for change in file_changes if change.action != "unchanged"]
+        )
+        if not success:
+            logger.error(commit_hash)
+            return None
         
-        description += "### Testing Checklist\n"
-        description += "- [ ] Feature works as expected\n"
-        description += "- [ ] No existing functionality broken\n"
-        description += "- [ ] UI/UX is consistent\n"
-        description += "- [ ] No console errors\n"
-        description += "- [ ] Mobile responsive (if applicable)\n\n"
+        state['commit_hash'] = commit_hash
         
-        description += "*This pull request was automatically generated by the DevOps Automation System*"
+        # Push to GitHub
+        if not await GitOperations.push_branch(state['branch_name']):
+            return None
+        
+        # Create pull request
+        return await self.github_client.create_pull_request(
+            state['branch_name'],
+            f"{state['issue_key']}: {state['issue_summary']}",
+            self._generate_pr_description(state)
+        )
+    
+    def _generate_pr_description(self, state: AgentState) -> str:
+        """Generate detailed PR description"""
+        requirements = state['requirements']
+        
+        features = ""
+        if requirements.get('functional'):
+            features = "### Implemented Features\n" + "".join(f"- {req}\n" for req in requirements['functional']) + "\n"
+        
+        files = ""
+        if state['file_changes']:
+            files = "### Files Changed\n" + "".join(
+                f"- `{change.file}` ({change.action}, {change.lines_added} lines)\n"
+                for change in state['file_changes']
+            ) + "\n"
+        
+        description = self.PR_DESCRIPTION.format(
+            issue_key=state['issue_key'],
+            issue_summary=state['issue_summary'],
+            issue_type=state['issue_type'],
+            issue_description=state['issue_description'],
+            features=features,
+            files=files,
+            method='🧠 AI-powered analysis' if requirements.get('ai_analysis', False) else '📋 Template-based generation',
+            trace_id=state['trace_id'],
+            generated=_now_iso(),
+            commit=state.get('commit_hash', 'N/A')
+        )
         
         return description
 
+# Jira comment posted when the whole pipeline fails
+_FAIL_TMPL = "❌ Automation Pipeline Failed\n\nError: {err}\nTrace ID: `{tid}`"
+
+# Fire-and-forget tasks (e.g. failure comments), referenced until done so they aren't GC'd
+_bg_tasks: Set[asyncio.Task] = set()
+
+# Pipeline status keyed by (had errors, wrote files)
+_STATUS = {
+    (False, False): "SUCCESS",
+    (False, True): "SUCCESS",
+    (True, True): "PARTIAL_SUCCESS",
+    (True, False): "FAILED"
+}
+
+def _merge_delta(state: AgentState, delta: Dict[str, Any]):
+    """Apply an agent's delta: extend lists, union dicts, replace scalars"""
+    for key, value in delta.items():
+        current = state.get(key)
+        if value is current:
+            continue
+        if isinstance(value, list) and isinstance(current, list):
+            current.extend(value)
+        elif isinstance(value, dict) and isinstance(current, dict):
+            current.update(value)
+        else:
+            state[key] = value
+
+async def _run_phase(phase: List[Tuple[str, Callable[[AgentState], Awaitable[Any]], bool]], state: AgentState) -> bool:
+    """Run a phase's agents concurrently and merge their results into state.
+    
+    Each agent sees a copy-on-write view: reads fall through to the shared
+    state, assignments land in a per-agent delta. Agents may return that
+    view or a plain dict holding only the keys they changed.
+    
+    Returns False if a critical agent failed and later phases should be skipped.
+    """
+    async def run(agent_name, agent, critical):
+        view = ChainMap({}, state)
+        try:
+            logger.info("[%s] Executing: %s", state['trace_id'], agent_name)
+            timeout = getattr(agent, "timeout", config.agent_timeout)
+            result = await asyncio.wait_for(agent(view), timeout=timeout)
+            return (view.maps[0] if result is view else result), True
+        except asyncio.TimeoutError:
+            error_msg = f"{agent_name} timed out after {timeout}s"
+        except Exception as e:
+            # One agent failing doesn't cancel its siblings
+            error_msg = f"{agent_name} failed: {str(e)}"
+        
+        logger.error("[%s] %s", state['trace_id'], error_msg)
+        state['errors'].append(error_msg)
+        return view.maps[0], not critical
+    
+    ok = True
+    for delta, agent_ok in await asyncio.gather(*(run(*entry) for entry in phase)):
+        _merge_delta(state, delta)
+        ok = ok and agent_ok
+    return ok
+
+def _finalize(trace_id: str, state: AgentState) -> Dict[str, Any]:
+    """Compute pipeline metrics, log them and build the result (no awaits needed)"""
+    errors = state.get('errors') or []
+    files_generated = len(state.get('generated_code') or {})
+    # Files whose content was already up to date were not written or committed
+    files_written = sum(1 for change in state.get('file_changes') or [] if change.action != "unchanged")
+    errors_count = len(errors)
+    success_rate = 100 - min(errors_count, 5) * 20
+    
+    status = _STATUS[(errors_count > 0, files_written > 0)]
+    
+    metrics = {
+        'trace_id': trace_id,
+        'status': status,
+        'files_generated': files_generated,
+        'files_written': files_written,
+        'success_rate': success_rate
+    }
+    logger.info(
+        "[%(trace_id)s] Pipeline completed! Status: %(status)s, files generated: %(files_generated)d, "
+        "files written: %(files_written)d, success rate: %(success_rate)d%%",
+        metrics,
+        extra=metrics
+    )
+    
+    return {
+        'trace_id': trace_id,
+        'issue_key': state['issue_key'],
+        'issue_summary': state['issue_summary'],
+        'status': status,
+        'files_generated': files_generated,
+        'files_written': files_written,
+        'success_rate': success_rate,
+        'branch_name': state.get('branch_name', ''),
+        'commit_hash': state.get('commit_hash', ''),
+        'pr_url': state.get('pr_url', ''),
+        'ai_analysis': state.get('requirements', {}).get('ai_analysis', False),
+        'errors': errors,
+        'timestamp': _now_iso()
+    }
+
 # Main processing function
 async def process_jira_webhook(webhook_payload: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -1372,119 +1863,102 @@ async def process_jira_webhook(webhook_payload: Dict[str, Any]) -> Dict[str, Any
         errors=[]
     )
     
-    logger.info(f"[{trace_id}] Starting production automation pipeline")
-    logger.info(f"[{trace_id}] LLM Available: {LLM_AVAILABLE and bool(config.openai_api_key)}")
-    logger.info(f"[{trace_id}] Jira Integration: {bool(config.jira_api_token)}")
-    logger.info(f"[{trace_id}] GitHub Integration: {bool(config.github_token)}")
+    logger.info("[%s] Starting production automation pipeline", trace_id)
+    logger.info("[%s] LLM Available: %s", trace_id, LLM_AVAILABLE and bool(config.openai_api_key))
+    logger.info("[%s] Jira Integration: %s", trace_id, bool(config.jira_api_token))
+    logger.info("[%s] GitHub Integration: %s", trace_id, bool(config.github_token))
     
     try:
         # Extract issue information
-        issue_data = webhook_payload.get('issue', {})
-        initial_state['issue_key'] = issue_data.get('key', '')
-        initial_state['issue_summary'] = issue_data.get('fields', {}).get('summary', '')
-        initial_state['issue_type'] = issue_data.get('fields', {}).get('issuetype', {}).get('name', '')
-        initial_state['issue_description'] = issue_data.get('fields', {}).get('description', '')
-        
-        logger.info(f"[{trace_id}] Processing: {initial_state['issue_key']} - {initial_state['issue_summary']}")
-        
-        # Execute production pipeline
-        agents = [
-            ("Requirements Analysis", RequirementsAnalyst()),
-            ("Code Generation", CodeGenerator()),
-            ("Git & GitHub Integration", ProductionGitIntegrator())
+        # Walk the payload once; Jira sends null for empty fields, so `or` rather than defaults
+        issue_data = webhook_payload.get('issue') or {}
+        fields = issue_data.get('fields') or {}
+        initial_state['issue_key'] = issue_data.get('key') or ''
+        initial_state['issue_summary'] = fields.get('summary') or ''
+        initial_state['issue_type'] = (fields.get('issuetype') or {}).get('name') or ''
+        initial_state['issue_description'] = fields.get('description') or ''
+        
+        logger.info("[%s] Processing: %s - %s", trace_id, initial_state['issue_key'], initial_state['issue_summary'])
+        
+        # Execute production pipeline; agents within a phase run concurrently
+        git_integrator = ProductionGitIntegrator()
+        # (name, agent, critical) - a critical failure skips the remaining phases
+        phases = [
+            [("Requirements Analysis", RequirementsAnalyst(), True)],
+            [
+                ("Code Generation", CodeGenerator(file_sink=git_integrator.file_sink), True),
+                ("Jira Kick-off", git_integrator.start_development, False)
+            ],
+            [("Git & GitHub Integration", git_integrator, True)]
         ]
         
         state = initial_state
-        for agent_name, agent in agents:
-            try:
-                logger.info(f"[{trace_id}] Executing: {agent_name}")
-                state = await agent(state)
-            except Exception as e:
-                error_msg = f"{agent_name} failed: {str(e)}"
-                logger.error(f"[{trace_id}] {error_msg}")
-                state['errors'].append(error_msg)
-                continue
+        for phase in phases:
+            if not await _run_phase(phase, state):
+                logger.error("[%s] Critical agent failed, skipping remaining phases", trace_id)
+                await git_integrator._drain_writes()
+                break
         
-        # Calculate final metrics
-        files_generated = len(state.get('generated_code', {}))
-        files_written = len(state.get('file_changes', []))
-        errors_count = len(state.get('errors', []))
-        success_rate = max(0, 100 - (errors_count * 20))
-        
-        status = "SUCCESS" if errors_count == 0 else ("PARTIAL_SUCCESS" if files_written > 0 else "FAILED")
-        
-        logger.info(f"[{trace_id}] Pipeline completed!")
-        logger.info(f"[{trace_id}] Status: {status}")
-        logger.info(f"[{trace_id}] Files generated: {files_generated}")
-        logger.info(f"[{trace_id}] Files written: {files_written}")
-        logger.info(f"[{trace_id}] Success rate: {success_rate}%")
-        
-        return {
-            'trace_id': trace_id,
-            'issue_key': state['issue_key'],
-            'issue_summary': state['issue_summary'],
-            'status': status,
-            'files_generated': files_generated,
-            'files_written': files_written,
-            'success_rate': success_rate,
-            'branch_name': state.get('branch_name', ''),
-            'commit_hash': state.get('commit_hash', ''),
-            'pr_url': state.get('pr_url', ''),
-            'ai_analysis': state.get('requirements', {}).get('ai_analysis', False),
-            'errors': state['errors'],
-            'timestamp': datetime.now().isoformat()
-        }
+        return _finalize(trace_id, state)
         
     except Exception as e:
-        logger.error(f"[{trace_id}] Pipeline failed: {e}")
+        logger.error("[%s] Pipeline failed: %s", trace_id, e)
         
-        # Update Jira about complete failure
-        jira_client = JiraClient()
-        await jira_client.add_comment(
+        # Update Jira about complete failure without holding up the response
+        task = asyncio.create_task(_jira_client.add_comment(
             initial_state.get('issue_key', 'UNKNOWN'),
-            f"❌ Automation Pipeline Failed\\n\\nError: {str(e)}\\nTrace ID: `{trace_id}`"
-        )
+            _FAIL_TMPL.format(err=e, tid=trace_id)
+        ))
+        _bg_tasks.add(task)
+        task.add_done_callback(_bg_tasks.discard)
         
         return {
             'trace_id': trace_id,
             'issue_key': initial_state.get('issue_key', 'UNKNOWN'),
             'status': 'FAILED',
             'error': str(e),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _now_iso()
         }
 
-# Configuration validation
+# Configuration validation; results are reused for CONFIG_CHECK_TTL seconds
+CONFIG_CHECK_TTL = 60
+REQUIRED_SETTINGS = (
+    'openai_api_key',
+    'jira_url',
+    'jira_username',
+    'jira_api_token',
+    'github_token',
+    'github_repo'
+)
+_config_checks: Optional[Tuple[float, Dict[str, bool]]] = None
+
 def validate_production_config() -> Dict[str, bool]:
     """Validate production configuration"""
-    checks = {
-        'openai_api_key': bool(config.openai_api_key),
-        'jira_url': bool(config.jira_url),
-        'jira_username': bool(config.jira_username), 
-        'jira_api_token': bool(config.jira_api_token),
-        'github_token': bool(config.github_token),
-        'github_repo': bool(config.github_repo),
-        'project_paths': all([
-            os.path.exists(config.project_root),
-            os.path.exists(config.frontend_path)
-        ])
-    }
+    global _config_checks
+    now = time.monotonic()
+    if _config_checks and now - _config_checks[0] < CONFIG_CHECK_TTL:
+        return dict(_config_checks[1])
+    
+    checks = {name: getattr(config, name) != "" for name in REQUIRED_SETTINGS}
+    checks['project_paths'] = all(os.path.exists(path) for path in (config.project_root, config.frontend_path))
     
-    return checks
+    _config_checks = (now, checks)
+    return dict(checks)
 
 # Example usage and testing
 if __name__ == "__main__":
     async def test_production_automation():
-        print("Testing production automation with full integration...")
+        lines = ["Testing production automation with full integration..."]
         
         # Validate configuration
         config_status = validate_production_config()
-        print("Configuration Status:")
-        for key, status in config_status.items():
-            print(f"  {key}: {'✅' if status else '❌'}")
+        lines.append("Configuration Status:")
+        lines.extend(f"  {key}: {'✅' if status else '❌'}" for key, status in config_status.items())
         
-        print(f"\nLLM Available: {LLM_AVAILABLE}")
-        print(f"Jira Integration: {bool(config.jira_api_token)}")
-        print(f"GitHub Integration: {bool(config.github_token)}")
+        lines.append(f"\nLLM Available: {LLM_AVAILABLE}")
+        lines.append(f"Jira Integration: {bool(config.jira_api_token)}")
+        lines.append(f"GitHub Integration: {bool(config.github_token)}")
+        print(*lines, sep="\n", flush=True)
         
         # Test webhook
         test_webhook = {
@@ -1499,18 +1973,30 @@ if __name__ == "__main__":
         }
         
         result = await process_jira_webhook(test_webhook)
-        print(f"\nTest completed:")
-        print(f"  Trace ID: {result['trace_id']}")
-        print(f"  Status: {result['status']}")
-        print(f"  Files generated: {result.get('files_generated', 0)}")
-        print(f"  Branch: {result.get('branch_name', 'N/A')}")
-        print(f"  PR URL: {result.get('pr_url', 'N/A')}")
-        print(f"  Commit: {result.get('commit_hash', 'N/A')[:8] if result.get('commit_hash') else 'N/A'}")
+        lines = [
+            "\nTest completed:",
+            f"  Trace ID: {result['trace_id']}",
+            f"  Status: {result['status']}",
+            f"  Files generated: {result.get('files_generated', 0)}",
+            f"  Branch: {result.get('branch_name', 'N/A')}",
+            f"  PR URL: {result.get('pr_url', 'N/A')}",
+            f"  Commit: {result.get('commit_hash', 'N/A')[:8] if result.get('commit_hash') else 'N/A'}"
+        ]
         
         if result['status'] == 'SUCCESS':
-            print("\n🎉 Production automation completed successfully!")
-            print("Check Jira for status updates and GitHub for the new pull request.")
+            lines.append("\n🎉 Production automation completed successfully!")
+            lines.append("Check Jira for status updates and GitHub for the new pull request.")
         else:
-            print(f"\n⚠️ Automation completed with issues: {result.get('errors', [])}")
+            lines.append(f"\n⚠️ Automation completed with issues: {result.get('errors', [])}")
+        print(*lines, sep="\n", flush=True)
+    
+    async def main():
+        try:
+            await test_production_automation()
+        finally:
+            # Let background Jira updates finish before the loop closes
+            await asyncio.gather(*_bg_tasks, return_exceptions=True)
+            close_openai_client()
+            await close_http_client()
     
-    asyncio.run(test_production_automation())
\ No newline at end of file
+    run(main())
\ No newline at end of file
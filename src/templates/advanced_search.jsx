@@ -0,0 +1,59 @@
+import React, { useState } from 'react';
+
+const AdvancedSearch = ({ onSearch, onFilterChange }) => {
+  const [searchTerm, setSearchTerm] = useState('');
+  const [filters, setFilters] = useState({
+    category: 'all',
+    priority: 'all',
+    status: 'all'
+  });
+
+  const handleSearchChange = (value) => {
+    setSearchTerm(value);
+    onSearch(value, filters);
+  };
+
+  const handleFilterChange = (filterType, value) => {
+    const newFilters = { ...filters, [filterType]: value };
+    setFilters(newFilters);
+    onFilterChange(newFilters);
+  };
+
+  return (
+    <div className="advanced-search">
+      <div className="search-input-container">
+        <input
+          type="text"
+          placeholder="Search todos..."
+          value={searchTerm}
+          onChange={(e) => handleSearchChange(e.target.value)}
+          className="search-input"
+        />
+      </div>
+      <div className="filters">
+        <select
+          value={filters.category}
+          onChange={(e) => handleFilterChange('category', e.target.value)}
+          className="filter-select"
+        >
+          <option value="all">All Categories</option>
+          <option value="work">Work</option>
+          <option value="personal">Personal</option>
+          <option value="shopping">Shopping</option>
+        </select>
+        <select
+          value={filters.priority}
+          onChange={(e) => handleFilterChange('priority', e.target.value)}
+          className="filter-select"
+        >
+          <option value="all">All Priorities</option>
+          <option value="high">High</option>
+          <option value="medium">Medium</option>
+          <option value="low">Low</option>
+        </select>
+      </div>
+    </div>
+  );
+};
+
+export default AdvancedSearch;
@@ -0,0 +1,25 @@
+import React from 'react';
+
+const CategoryFilter = ({ selectedCategory, onCategoryChange }) => {
+  const categories = ['all', 'work', 'personal', 'shopping', 'health'];
+  
+  return (
+    <div className="category-filter">
+      <label htmlFor="category-select">Filter by Category:</label>
+      <select 
+        id="category-select"
+        value={selectedCategory}
+        onChange={(e) => onCategoryChange(e.target.value)}
+        className="category-select"
+      >
+        {categories.map(category => (
+          <option key={category} value={category}>
+            {category.charAt(0).toUpperCase() + category.slice(1)}
+          </option>
+        ))}
+      </select>
+    </div>
+  );
+};
+
+export default CategoryFilter;
@@ -0,0 +1,12 @@
+import React from 'react';
+
+const @@component_name = () => {
+  return (
+    <div className="@@css_class">
+      <h3>@@component_name</h3>
+      <p>Generated component for: @@description...</p>
+    </div>
+  );
+};
+
+export default @@component_name;
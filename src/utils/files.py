@@ -0,0 +1,28 @@
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Union
+
+
+def atomic_write_text(path: Union[str, Path], text: str):
+    """Write text as UTF-8 through a temporary file renamed over the target.
+
+    Readers (concurrent webhooks, file watchers) never see a partial file, and
+    hardlinked backups of the old file keep their content. An existing file's
+    permission bits are kept. Blocking; run it in a worker thread.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        # Encoded once; a single write of the whole payload, no newline translation
+        with open(tmp_path, 'wb') as f:
+            f.write(text.encode('utf-8'))
+        if path.exists():
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,29 @@
+from typing import Optional
+
+import httpx
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide keep-alive connection pool, creating it on first use.
+
+    Jira, GitHub and OpenAI requests all go through this one client, so each
+    host's TLS connections are reused across calls and webhooks instead of
+    being set up per client. Call it from inside the running event loop.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60.0),
+        )
+    return _client
+
+
+async def close_http_client():
+    """Close the shared pool; call once on application shutdown"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,24 @@
+import json
+from dataclasses import asdict, is_dataclass
+
+# Faster JSON for API payloads, LLM responses and batch files when orjson is installed
+try:
+    import orjson
+
+    def json_loads(data):
+        return orjson.loads(data)
+
+    def json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _json_default(obj):
+        # Match orjson, which serializes dataclasses (FileChange, JiraTransition) natively
+        if is_dataclass(obj) and not isinstance(obj, type):
+            return asdict(obj)
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def json_loads(data):
+        return json.loads(data)
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj, default=_json_default).encode("utf-8")
@@ -0,0 +1,93 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from utils.files import atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(model: str, messages: List[Dict[str, str]], **params: Any) -> str:
+    """Digest of everything that determines a completion (model, messages, sampling params)"""
+    blob = json.dumps([model, messages, params], sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(blob.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class LLMCache:
+    """Content-addressed cache of completion texts.
+
+    Keeps the most recent `max_entries` in memory and, if `directory` is set,
+    also persists one file per key so repeated prompts survive restarts.
+    Entries older than `ttl` seconds (if set) are treated as misses.
+    Only cache deterministic (temperature 0) completions, or set a ttl.
+    """
+
+    def __init__(self, max_entries: int = 256, directory: Optional[str] = None, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory else None
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if self._fresh(entry[0]):
+                self._entries.move_to_end(key)
+                return entry[1]
+            del self._entries[key]
+        if self.directory is None:
+            return None
+
+        entry = await asyncio.to_thread(self._read, key)
+        if entry is None or not self._fresh(entry[0]):
+            return None
+        self._remember(key, entry[1], entry[0])
+        return entry[1]
+
+    async def set(self, key: str, text: str):
+        self._remember(key, text)
+        if self.directory is not None:
+            try:
+                await asyncio.to_thread(self._write, key, text)
+            except OSError as e:
+                logger.warning(f"Could not persist LLM cache entry {key}: {e}")
+
+    async def get_or_create(self, key: str, factory: Callable[[], Awaitable[str]]) -> str:
+        """Return the cached text for key, or await factory() and cache a non-empty result"""
+        text = await self.get(key)
+        if text is not None:
+            logger.info(f"LLM cache hit: {key}")
+            return text
+
+        text = await factory()
+        if text:
+            await self.set(key, text)
+        return text
+
+    def _fresh(self, created: float) -> bool:
+        return self.ttl is None or time.time() - created < self.ttl
+
+    def _remember(self, key: str, text: str, created: Optional[float] = None):
+        self._entries[key] = (time.time() if created is None else created, text)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.txt"
+
+    def _read(self, key: str) -> Optional[Tuple[float, str]]:
+        """Return (mtime, text) for a stored entry"""
+        path = self._path(key)
+        try:
+            return path.stat().st_mtime, path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def _write(self, key: str, text: str):
+        atomic_write_text(self._path(key), text)
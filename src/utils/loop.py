@@ -0,0 +1,21 @@
+import asyncio
+import sys
+from typing import Any, Coroutine
+
+# libuv-based event loop where installed (not supported on Windows)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = sys.platform != "win32"
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+
+def run(main: Coroutine[Any, Any, Any]) -> Any:
+    """Run a coroutine to completion, on uvloop when available, else with asyncio.run.
+
+    Only the loop created for this call is affected; the global event loop
+    policy is left alone, so importing a module never switches loops.
+    """
+    if UVLOOP_AVAILABLE:
+        return uvloop.run(main)
+    return asyncio.run(main)
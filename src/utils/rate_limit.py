@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute budgets shared by concurrent callers.
+
+    Both budgets are token buckets that refill continuously up to one minute's
+    allowance. acquire() waits until a request estimated at `tokens` fits under
+    both, so bursts of concurrent LLM calls are spread out instead of being
+    answered with 429s. A limit of 0 disables that budget.
+
+    Checking and reserving happen without an await in between, so no lock is
+    needed on the single-threaded event loop (and none is bound to a loop).
+    """
+
+    def __init__(self, rpm: float, tpm: float):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed_minutes = (now - self._updated) / 60
+        self._updated = now
+        if self.rpm > 0:
+            self._requests = min(self.rpm, self._requests + elapsed_minutes * self.rpm)
+        if self.tpm > 0:
+            self._tokens = min(self.tpm, self._tokens + elapsed_minutes * self.tpm)
+
+    async def acquire(self, tokens: int = 0):
+        """Wait for budget for one request using about `tokens` tokens, then reserve it"""
+        if self.tpm > 0:
+            # A request bigger than the whole budget would otherwise wait forever
+            tokens = min(tokens, self.tpm)
+        while True:
+            self._refill()
+            request_wait = 0.0 if self.rpm <= 0 else max(0.0, 1 - self._requests) / self.rpm
+            token_wait = 0.0 if self.tpm <= 0 else max(0.0, tokens - self._tokens) / self.tpm
+            wait = max(request_wait, token_wait) * 60
+            if wait <= 0:
+                if self.rpm > 0:
+                    self._requests -= 1
+                if self.tpm > 0:
+                    self._tokens -= tokens
+                return
+            await asyncio.sleep(wait)
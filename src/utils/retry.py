@@ -0,0 +1,47 @@
+import asyncio
+import logging
+import random
+from typing import Awaitable, Callable, Optional, Tuple, Type, TypeVar
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+async def retry_async(
+    coro_factory: Callable[[], Awaitable[T]],
+    attempts: int = 3,
+    base: float = 0.5,
+    retry_on: Tuple[Type[BaseException], ...] = (ConnectionError, TimeoutError),
+    retry_if: Optional[Callable[[T], bool]] = None,
+    retry_after: Optional[Callable[[T], Optional[float]]] = None,
+) -> T:
+    """Await coro_factory() until it succeeds, backing off base * 2**i seconds plus jitter.
+
+    Exceptions in retry_on are retried and re-raised after the last attempt.
+    Results for which retry_if returns True are retried as well; the last such
+    result is returned so callers can still inspect it. retry_after may return
+    a server-requested delay (e.g. from a Retry-After header) for such results.
+
+    Always sleeps with asyncio.sleep - a blocking time.sleep here would stall
+    every other webhook being handled on the event loop.
+    """
+    for i in range(attempts):
+        last_attempt = i == attempts - 1
+        delay = None
+        try:
+            result = await coro_factory()
+        except retry_on as e:
+            if last_attempt:
+                raise
+            logger.warning(f"Attempt {i + 1}/{attempts} failed: {e}")
+        else:
+            if last_attempt or retry_if is None or not retry_if(result):
+                return result
+            logger.warning(f"Attempt {i + 1}/{attempts} returned a retryable result")
+            if retry_after is not None:
+                delay = retry_after(result)
+
+        if delay is None:
+            delay = base * 2 ** i + random.uniform(0, base)
+        await asyncio.sleep(delay)
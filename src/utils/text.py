@@ -0,0 +1,5 @@
+def count_lines(content: str) -> int:
+    """Line count without materialising a list of lines (a trailing newline ends the last line)"""
+    if not content:
+        return 0
+    return content.count('\n') + (0 if content.endswith('\n') else 1)
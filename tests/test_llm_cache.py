@@ -0,0 +1,112 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils import llm_cache
+from utils.llm_cache import LLMCache, cache_key
+
+MESSAGES = [{"role": "user", "content": "Generate SearchBar.jsx"}]
+
+
+def test_cache_key_covers_model_messages_and_params():
+    """Test that the key is stable and changes with anything that affects the completion"""
+    key = cache_key("gpt-4o", MESSAGES, temperature=0, max_tokens=1000)
+
+    assert key == cache_key("gpt-4o", list(MESSAGES), max_tokens=1000, temperature=0)
+    assert key != cache_key("gpt-4o-mini", MESSAGES, temperature=0, max_tokens=1000)
+    assert key != cache_key("gpt-4o", MESSAGES, temperature=0.1, max_tokens=1000)
+    assert key != cache_key("gpt-4o", [{"role": "user", "content": "Generate App.jsx"}], temperature=0, max_tokens=1000)
+
+
+@pytest.mark.asyncio
+async def test_lru_evicts_least_recently_used():
+    """Test that a read refreshes an entry, so the oldest untouched one is evicted"""
+    cache = LLMCache(max_entries=2)
+    await cache.set("a", "A")
+    await cache.set("b", "B")
+    assert await cache.get("a") == "A"
+
+    await cache.set("c", "C")
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == "A"
+    assert await cache.get("c") == "C"
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl(monkeypatch):
+    """Test that entries older than the ttl are misses"""
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    cache = LLMCache(ttl=60)
+    await cache.set("key", "text")
+
+    now[0] += 59
+    assert await cache.get("key") == "text"
+
+    now[0] += 2
+    assert await cache.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_disk_store_round_trip(tmp_path):
+    """Test that persisted entries are read back by a fresh cache and no temp files remain"""
+    key = cache_key("gpt-4o", MESSAGES, temperature=0)
+    await LLMCache(directory=str(tmp_path)).set(key, "import React from 'react';\n")
+
+    assert await LLMCache(directory=str(tmp_path)).get(key) == "import React from 'react';\n"
+    assert [path.name for path in tmp_path.rglob("*") if path.is_file()] == [f"{key}.txt"]
+
+
+@pytest.mark.asyncio
+async def test_failed_disk_write_leaves_no_partial_file(tmp_path, monkeypatch):
+    """Test that a failed rename keeps the entry in memory and removes the temp file"""
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("utils.files.os.replace", failing_replace)
+    cache = LLMCache(directory=str(tmp_path))
+    await cache.set("ab12", "text")
+
+    assert await cache.get("ab12") == "text"
+    assert not [path for path in tmp_path.rglob("*") if path.is_file()]
+    assert await LLMCache(directory=str(tmp_path)).get("ab12") is None
+
+
+@pytest.mark.asyncio
+async def test_malformed_json_responses_are_never_cached():
+    """Test that a factory that rejects its response caches nothing and is retried"""
+    cache = LLMCache()
+    responses = iter(['{"functional": [', '{"functional": []}'])
+    calls = []
+
+    async def complete():
+        calls.append(1)
+        text = next(responses)
+        json.loads(text)  # Raises on the truncated response, like the callers' validation
+        return text
+
+    with pytest.raises(ValueError):
+        await cache.get_or_create("key", complete)
+    assert await cache.get("key") is None
+
+    assert await cache.get_or_create("key", complete) == '{"functional": []}'
+    assert await cache.get_or_create("key", complete) == '{"functional": []}'
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_empty_responses_are_not_cached():
+    """Test that an empty completion is returned but not stored"""
+    cache = LLMCache()
+
+    async def complete():
+        return ""
+
+    assert await cache.get_or_create("key", complete) == ""
+    assert await cache.get("key") is None
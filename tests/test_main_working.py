@@ -0,0 +1,118 @@
+import importlib.util
+import json
+import os
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+SRC_DIR = Path(__file__).parent.parent / 'src'
+
+# Add the src directory to Python path
+sys.path.insert(0, str(SRC_DIR))
+
+
+@pytest.fixture(scope="module")
+def pipeline(tmp_path_factory):
+    """main_working-with_CURL.py, loaded from a scratch directory for its logs/ file handler"""
+    workdir = tmp_path_factory.mktemp("pipeline")
+    (workdir / "logs").mkdir()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        spec = importlib.util.spec_from_file_location("main_working", SRC_DIR / "main_working-with_CURL.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        os.chdir(cwd)
+    return module
+
+
+def _stream(pipeline, deltas):
+    """Feed deltas until the stream reports the closing fence; return (code, deltas consumed)"""
+    stream = pipeline._FencedCodeStream()
+    consumed = 0
+    for delta in deltas:
+        consumed += 1
+        if stream.feed(delta):
+            break
+    return stream.result(), consumed
+
+
+def test_fenced_stream_handles_fence_split_across_deltas(pipeline):
+    """Test that a fence split over deltas is recognised and reading stops at the closing fence"""
+    deltas = ["Here is the component:\n``", "`jsx\nimport A", " from 'a';\n``", "`\nThis component", " renders A."]
+
+    code, consumed = _stream(pipeline, deltas)
+
+    assert code == "import A from 'a';\n"
+    assert consumed == 4
+
+
+def test_fenced_stream_skips_language_tag(pipeline):
+    """Test that the language tag on the opening fence is not part of the code"""
+    code, _ = _stream(pipeline, ["```javascript\nconst x = 1;\n```\n"])
+
+    assert code == "const x = 1;\n"
+
+
+def test_fenced_stream_without_fence_returns_whole_text(pipeline):
+    """Test that an unfenced response is returned in full, including an unterminated last line"""
+    code, consumed = _stream(pipeline, ["import A from 'a';\n", "export default A;"])
+
+    assert code == "import A from 'a';\nexport default A;"
+    assert consumed == 2
+
+
+def test_fenced_stream_without_closing_fence_returns_code(pipeline):
+    """Test that a stream ending inside the code block returns everything after the opening fence"""
+    code, consumed = _stream(pipeline, ["Sure:\n```jsx\nimport A from 'a';\n", "export default A;"])
+
+    assert code == "import A from 'a';\nexport default A;"
+    assert consumed == 2
+
+
+@pytest.fixture
+def jira(pipeline, monkeypatch):
+    """(JiraClient with credentials, list of (method, transition id) requests, POST statuses by transition id)"""
+    for name, value in (("jira_url", "https://jira.test"), ("jira_username", "bot@test"), ("jira_api_token", "token")):
+        monkeypatch.setattr(pipeline.config, name, value)
+    monkeypatch.setattr(pipeline.JiraClient, "_transition_ids", {("PROJ", "done"): "11"})
+
+    calls = []
+    statuses = {}
+
+    async def fake_request(method, url, **kwargs):
+        if method == "GET":
+            calls.append(("GET", None))
+            return httpx.Response(200, json={"transitions": [{"id": "31", "to": {"name": "Done"}}]})
+        transition_id = json.loads(kwargs["content"])["transition"]["id"]
+        calls.append(("POST", transition_id))
+        return httpx.Response(statuses.get(transition_id, 204))
+
+    monkeypatch.setattr(pipeline, "_request", fake_request)
+    return pipeline.JiraClient(), calls, statuses
+
+
+@pytest.mark.asyncio
+async def test_stale_transition_id_is_refetched_once(pipeline, jira):
+    """Test that a 400 for a cached transition ID refetches the IDs and retries with the fresh one"""
+    client, calls, statuses = jira
+    statuses["11"] = 400
+
+    assert await client.update_issue_status("PROJ-7", "Done", "Deployed") is True
+
+    assert calls == [("POST", "11"), ("GET", None), ("POST", "31")]
+    assert pipeline.JiraClient._transition_ids[("PROJ", "done")] == "31"
+
+
+@pytest.mark.asyncio
+async def test_rejected_fresh_transition_id_is_not_retried(pipeline, jira):
+    """Test that a refetched ID that is rejected too fails instead of looping"""
+    client, calls, statuses = jira
+    statuses.update({"11": 400, "31": 400})
+
+    assert await client.update_issue_status("PROJ-7", "Done", "Deployed") is False
+
+    assert calls == [("POST", "11"), ("GET", None), ("POST", "31")]
@@ -0,0 +1,24 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils.rate_limit import RateLimiter
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spreads_requests_beyond_budget():
+    """Test that requests past the per-minute budget wait for it to refill"""
+    limiter = RateLimiter(rpm=600, tpm=0)  # 10 requests per second
+
+    start = time.monotonic()
+    await asyncio.gather(*(limiter.acquire() for _ in range(602)))
+    elapsed = time.monotonic() - start
+
+    # The full bucket covers 600 at once; the last two wait ~0.1s each
+    assert 0.15 <= elapsed < 1.0
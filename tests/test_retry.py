@@ -0,0 +1,63 @@
+import ast
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).parent.parent / 'src'
+
+# Add the src directory to Python path
+sys.path.insert(0, str(SRC_DIR))
+
+from utils.retry import retry_async
+
+
+def _imports_asyncio(tree: ast.AST) -> bool:
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import) and any(a.name == 'asyncio' for a in node.names):
+            return True
+        if isinstance(node, ast.ImportFrom) and node.module == 'asyncio':
+            return True
+    return False
+
+
+def _calls_time_sleep(tree: ast.AST) -> bool:
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and node.func.attr == 'sleep'
+                and isinstance(node.func.value, ast.Name)
+                and node.func.value.id == 'time'):
+            return True
+    return False
+
+
+def test_no_blocking_sleep_in_async_modules():
+    """time.sleep stalls every webhook on the event loop - use asyncio.sleep"""
+    offenders = []
+    for path in SRC_DIR.rglob('*.py'):
+        try:
+            tree = ast.parse(path.read_text(encoding='utf-8'))
+        except SyntaxError:
+            continue  # Not parseable on this interpreter version
+        if _imports_asyncio(tree) and _calls_time_sleep(tree):
+            offenders.append(str(path.relative_to(SRC_DIR)))
+
+    assert not offenders, f"time.sleep used in asyncio modules: {offenders}"
+
+
+@pytest.mark.asyncio
+async def test_retry_async_retries_until_success():
+    """Test that transient failures and retryable results are retried"""
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ConnectionError("reset")
+        return 503 if len(calls) == 2 else 200
+
+    result = await retry_async(flaky, attempts=3, base=0, retry_if=lambda status: status == 503)
+
+    assert result == 200
+    assert len(calls) == 3